@@ -0,0 +1,92 @@
+from typing import Deque, Set
+from collections import deque
+import atexit
+import os
+import threading
+
+# Modules
+from app.javascript_renderer import JavaScriptRenderer
+
+# ==================== Browser Pool ====================
+
+class BrowserPool:
+    """
+    Process-wide pool of headless JavaScriptRenderers, so Chrome is launched once per
+    slot instead of once per request. Browsers are started lazily, up to pool_size.
+    """
+
+    def __init__(self, pool_size: int = 2):
+        self.pool_size = max(1, pool_size)
+        self._idle: Deque[JavaScriptRenderer] = deque()
+        self._pooled: Set[int] = set()
+        # Notified whenever a browser goes back in the pool or frees its slot
+        self._available = threading.Condition()
+
+    def acquire(self, headless: bool = True) -> JavaScriptRenderer:
+        """
+        Take a started renderer, waiting for one to be released (or for a slot to free up)
+        if every slot is busy. Headed browsers aren't pooled; they get a fresh renderer that release() quits.
+        """
+        if not headless:
+            return JavaScriptRenderer(headless=False).open()
+
+        with self._available:
+            while not self._idle and len(self._pooled) >= self.pool_size:
+                self._available.wait()
+            if self._idle:
+                return self._idle.popleft()
+            renderer = JavaScriptRenderer(headless=True)
+            self._pooled.add(id(renderer))
+
+        # Start the browser outside the lock, so other requests aren't held up by the launch
+        try:
+            return renderer.open()
+        except Exception:
+            self._discard(renderer)
+            raise
+
+    def release(self, renderer: JavaScriptRenderer):
+        """Hand a renderer back, clearing its cookies and tab for the next request"""
+        if id(renderer) not in self._pooled:
+            renderer.close()
+            return
+
+        try:
+            renderer.reset()
+        except Exception:
+            # A crashed or wedged browser frees its slot instead of going back in the pool
+            self._discard(renderer)
+            return
+        with self._available:
+            self._idle.append(renderer)
+            self._available.notify()
+
+    def shutdown(self):
+        """Quit every idle browser"""
+        while True:
+            with self._available:
+                if not self._idle:
+                    return
+                renderer = self._idle.popleft()
+            self._discard(renderer)
+
+    def _discard(self, renderer: JavaScriptRenderer):
+        try:
+            renderer.close()
+        except Exception:
+            pass
+        with self._available:
+            self._pooled.discard(id(renderer))
+            self._available.notify()
+
+
+pool = BrowserPool(int(os.getenv("BROWSER_POOL_SIZE", 2)))
+atexit.register(pool.shutdown)
+
+def acquire(headless: bool = True) -> JavaScriptRenderer:
+    """Take a renderer from the shared pool"""
+    return pool.acquire(headless)
+
+def release(renderer: JavaScriptRenderer):
+    """Return a renderer to the shared pool"""
+    pool.release(renderer)
@@ -1,20 +1,122 @@
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple, Iterator
+from dataclasses import asdict, is_dataclass
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from contextlib import contextmanager
+import codecs
+import threading
 import requests
 import time
+import logging
 import json
-from urllib.parse import urlparse, urljoin
-from bs4 import BeautifulSoup
+from urllib.parse import urljoin, urlsplit, urlunsplit
+from bs4 import BeautifulSoup, SoupStrainer
 import cloudscraper
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import lxml.html
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
 
 # Modules
 from app.data_models import CrawlConfig, CrawlResult
 from app.javascript_renderer import JavaScriptRenderer
-from app.extraction_strategies import ExtractionStrategy, GenericStrategy, SelectorStrategy, ProductStrategy, ArticleStrategy
+from app import browser_pool
+from app.extraction_strategies import ExtractionStrategy, GenericStrategy, SelectorStrategy, ProductStrategy, ArticleStrategy, StreamedPage
 
 
 #==================== Crawler ====================
 
+logger = logging.getLogger(__name__)
+
+# Only the anchors are needed to discover links
+LINK_STRAINER = SoupStrainer('a', href=True)
+
+# Bytes handed to a streaming strategy's parser at a time
+STREAM_CHUNK_SIZE = 8192
+
+# Results buffered before each write in crawl_to_jsonl
+JSONL_BATCH_SIZE = 64
+
+# Responses with any other Content-Type are not parsed
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml')
+
+# Links to these files are never queued
+BINARY_EXTENSIONS = (
+    '.pdf', '.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.ico',
+    '.zip', '.gz', '.tar', '.rar', '.7z', '.exe', '.dmg',
+    '.mp3', '.mp4', '.avi', '.mov', '.woff', '.woff2'
+)
+
+def resolve_parser(parser: str) -> str:
+    """Return the requested BeautifulSoup parser, falling back to html.parser when lxml is missing"""
+    if parser == 'lxml' and not LXML_AVAILABLE:
+        return 'html.parser'
+    return parser
+
+def normalize_url(url: str) -> str:
+    """Canonical form of a URL for de-duplication: lowercase scheme and host, no fragment"""
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/', parts.query, ''))
+
+def _is_html(response: requests.Response) -> bool:
+    """Whether a response should be parsed; a missing Content-Type gets the benefit of the doubt"""
+    content_type = response.headers.get('Content-Type', '').split(';', 1)[0].strip().lower()
+    return not content_type or content_type.startswith(HTML_CONTENT_TYPES)
+
+def response_charset(response: requests.Response) -> Optional[str]:
+    """The charset declared in a response's Content-Type header, if Python knows it.
+    Unlike response.encoding this doesn't default text/html to ISO-8859-1."""
+    for param in response.headers.get('Content-Type', '').split(';')[1:]:
+        name, _, value = param.partition('=')
+        if name.strip().lower() == 'charset':
+            try:
+                return codecs.lookup(value.strip().strip('"\'')).name
+            except LookupError:
+                return None
+    return None
+
+def extract_page(url: str, strategy: ExtractionStrategy, session: requests.Session, timeout: int = 10,
+                 parser: str = 'lxml') -> CrawlResult:
+    """
+    Fetch and extract one page without a crawler (no frontier, throttle or Cloudflare client).
+    Errors are reported in the result as in a crawl; a 403 comes back with no data, for callers
+    that want to retry it through WebCrawler.
+    """
+    try:
+        with session.get(url, timeout=timeout, stream=True) as response:
+            data = {}
+            if response.status_code != 403 and _is_html(response):
+                markup = response.iter_content(STREAM_CHUNK_SIZE) if strategy.STREAMING else response.content
+                data = strategy.extract(strategy.parse(markup, parser, response_charset(response)), url)
+        return CrawlResult(url=url, status_code=response.status_code, data=data, links=[])
+    except Exception as e:
+        return CrawlResult(url=url, status_code=0, data={}, error=str(e))
+
+def _json_default(obj: Any) -> Any:
+    if is_dataclass(obj):
+        return asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def to_json(record: Any) -> bytes:
+    """Serialize a record to UTF-8 JSON, with orjson when it's installed.
+    Dataclasses such as CrawlResult are accepted directly; orjson encodes them without copying to a dict."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(record)
+    return json.dumps(record, default=_json_default).encode('utf-8')
+
+def _jsonl_line(record: Any) -> bytes:
+    """Serialize a record as one JSON line"""
+    return to_json(record) + b'\n'
+
 class WebCrawler:
     """Main crawler engine"""
     
@@ -22,8 +124,13 @@ class WebCrawler:
         self.config = config
         self.strategy = strategy
         self.visited = set()
-        self.results = []
+        self._pages = 0
         self.session = requests.Session()
+        # One Cloudflare-capable client for every 403, so its cookies and connections are reused
+        self._cf_scraper = cloudscraper.create_scraper()
+        self.parser = resolve_parser(config.parser)
+        self._throttle_lock = threading.Lock()
+        self._next_time: Dict[str, float] = {}  # host -> earliest start of its next request
         
         headers = {
             'User-Agent': config.user_agent
@@ -32,74 +139,203 @@ class WebCrawler:
             headers.update(config.headers)
         self.session.headers.update(headers)
     
-    def crawl(self) -> List[CrawlResult]:
-        """Start crawling from the initial URL"""
-        self._crawl_recursive(self.config.url, 0)
-        return self.results
+    def crawl(self) -> Iterator[CrawlResult]:
+        """Crawl breadth-first from the initial URL, keeping up to `concurrency` pages in flight.
+        A worker picks up the next URL as soon as its page is done, so one slow host doesn't hold
+        up the rest. Results are yielded as they complete; use list(crawler.crawl()) to collect them all."""
+        queue = deque([(self.config.url, 0)])
+        self._pages = 0
+        workers = self._max_workers()
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending: Dict[Future, int] = {}  # in-flight page -> its depth, in submission order
+            while True:
+                budget = self.config.max_pages - self._pages - len(pending)
+                for url, depth in self._next_batch(queue, min(workers - len(pending), budget)):
+                    pending[executor.submit(self._crawl_page, url, depth)] = depth
+                if not pending:
+                    break
+                
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in [f for f in pending if f in done]:
+                    depth = pending.pop(future)
+                    result, fetched = future.result()
+                    # Skipped non-HTML responses are reported but don't use up the page budget
+                    if fetched:
+                        self._pages += 1
+                    
+                    # Follow links if configured
+                    if self.config.follow_links and result.links:
+                        queue.extend((link, depth + 1) for link in result.links[:self.config.max_links_per_page])
+                    
+                    yield result
     
-    def _crawl_recursive(self, url: str, depth: int):
-        """Recursively crawl pages"""
-        if depth > self.config.max_depth or len(self.results) >= self.config.max_pages:
-            return
+    def crawl_to_jsonl(self, path: str) -> int:
+        """Crawl and write each result to `path` as one JSON line, returning the number of pages written"""
+        count = 0
+        buffer: List[bytes] = []
+        with open(path, 'wb') as f:
+            try:
+                for result in self.crawl():
+                    buffer.append(_jsonl_line(result))
+                    count += 1
+                    if len(buffer) >= JSONL_BATCH_SIZE:
+                        f.writelines(buffer)
+                        buffer.clear()
+            finally:
+                f.writelines(buffer)
+        return count
+    
+    def _max_workers(self) -> int:
+        """Number of pages fetched in parallel"""
+        return max(1, self.config.concurrency)
+    
+    def _next_batch(self, queue: deque, size: int) -> List[Tuple[str, int]]:
+        """Pop up to `size` unvisited URLs within the depth limit"""
+        batch = []
         
-        if url in self.visited:
-            return
+        while queue and len(batch) < size:
+            url, depth = queue.popleft()
+            key = normalize_url(url)
+            if depth > self.config.max_depth or key in self.visited:
+                continue
+            self.visited.add(key)
+            batch.append((url, depth))
         
-        self.visited.add(url)
+        return batch
+    
+    def _wait_for_turn(self, url: str):
+        """Space out request start times to the URL's host by config.delay across all worker threads"""
+        host = urlsplit(url).netloc.lower()
+        with self._throttle_lock:
+            now = time.monotonic()
+            start = max(now, self._next_time.get(host, 0.0))
+            self._next_time[host] = start + self.config.delay
         
-        try:
-            time.sleep(self.config.delay)
-            response = self.session.get(url, timeout=self.config.timeout)
-            if response.status_code == 403:
-                # Handle Cloudflare protection
-                scraper = cloudscraper.create_scraper()
-                response = scraper.get(url, timeout=self.config.timeout)
+        if start > now:
+            time.sleep(start - now)
+    
+    @contextmanager
+    def _fetch(self, url: str) -> Iterator[Tuple[int, Any, Optional[str]]]:
+        """Download a page and yield its status code, markup (an iterator of chunks for streaming strategies)
+        and declared charset. The markup is None when the response isn't HTML.
+        The response is closed on exit, so a page that fails to parse doesn't keep its pooled connection."""
+        # Always stream, so non-HTML bodies are never downloaded
+        response = self.session.get(url, timeout=self.config.timeout, stream=True)
+        if response.status_code == 403:
+            # Handle Cloudflare protection
+            response.close()
+            response = self._cf_scraper.get(url, timeout=self.config.timeout, stream=True)
+        
+        with response:
+            if not _is_html(response):
+                if self.config.debug_log:
+                    logger.debug("skipped %s (%s)", url, response.headers.get('Content-Type'))
+                yield response.status_code, None, None
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            with open('log.json', 'w') as f:
-                json.dump({'url': url, 'soup': soup.prettify()}, f)
-            data = self.strategy.extract(soup, url)
+            # Dumping the HTML needs the whole body, so it turns streaming off
+            elif self.strategy.STREAMING and not self.config.debug_log_html:
+                if self.config.debug_log:
+                    logger.debug("streaming %s", url)
+                yield response.status_code, response.iter_content(STREAM_CHUNK_SIZE), response_charset(response)
             
-            links = []
-            if self.config.follow_links and depth < self.config.max_depth:
-                links = self._extract_links(soup, url)
+            else:
+                if self.config.debug_log:
+                    logger.debug("fetched %s (%d bytes)", url, len(response.content))
+                if self.config.debug_log_html:
+                    logger.debug("html of %s:\n%s", url, response.text)
+                yield response.status_code, response.content, response_charset(response)
+    
+    def _crawl_page(self, url: str, depth: int) -> Tuple[CrawlResult, bool]:
+        """Fetch a single page and extract its data and links.
+        Also returns whether the page counts toward max_pages, which skipped non-HTML responses don't."""
+        try:
+            self._wait_for_turn(url)
+            with self._fetch(url) as (status_code, markup, encoding):
+                if markup is None:
+                    return CrawlResult(
+                        url=url,
+                        status_code=status_code,
+                        data={},
+                        links=[]
+                    ), False
+                
+                document = self.strategy.parse(markup, self.parser, encoding)
+                data = self.strategy.extract(document, url)
+                
+                links = []
+                if self.config.follow_links and depth < self.config.max_depth:
+                    links = self._extract_links(self._link_document(document, markup), url)
             
-            result = CrawlResult(
+            return CrawlResult(
                 url=url,
-                status_code=response.status_code,
+                status_code=status_code,
                 data=data,
                 links=links
-            )
-            self.results.append(result)
-            
-            # Follow links if configured
-            if self.config.follow_links:
-                for link in links[:5]:  # Limit links per page
-                    if len(self.results) < self.config.max_pages:
-                        self._crawl_recursive(link, depth + 1)
+            ), True
             
         except Exception as e:
-            result = CrawlResult(
+            return CrawlResult(
                 url=url,
                 status_code=0,
                 data={},
                 error=str(e)
-            )
-            self.results.append(result)
+            ), True
+    
+    def _link_document(self, document, markup):
+        """Return a document holding the page's anchors, reparsing the page if the strategy strained them out"""
+        if not isinstance(document, BeautifulSoup) or self.strategy.PARSE_ONLY is None:
+            return document
+        if LXML_AVAILABLE:
+            try:
+                return lxml.html.document_fromstring(markup)
+            except (etree.ParserError, ValueError):
+                pass
+        return BeautifulSoup(markup, self.parser, parse_only=LINK_STRAINER)
     
-    def _extract_links(self, soup: BeautifulSoup, base_url: str) -> List[str]:
-        """Extract valid links from page"""
+    def _absolute_hrefs(self, document, base_url: str) -> List[str]:
+        """Absolute URLs of the anchors' hrefs in a BeautifulSoup document, lxml tree or streamed page"""
+        if isinstance(document, StreamedPage):
+            return self._join_all(base_url, document.hrefs)
+        if isinstance(document, BeautifulSoup):
+            return self._join_all(base_url, (str(anchor['href']) for anchor in document.find_all('a', href=True)))
+        
+        # lxml resolves the links itself, honouring any <base href>
+        root = document.getroot() if hasattr(document, 'getroot') else document
+        root.make_links_absolute(base_url, handle_failures='ignore')
+        return [link for element, attribute, link, _ in root.iterlinks() if attribute == 'href' and element.tag == 'a']
+    
+    @staticmethod
+    def _join_all(base_url: str, hrefs) -> List[str]:
+        """Resolve hrefs against base_url, dropping malformed ones"""
+        links = []
+        for href in hrefs:
+            try:
+                links.append(urljoin(base_url, href.strip()))
+            except ValueError:
+                continue
+        return links
+    
+    def _extract_links(self, document, base_url: str) -> List[str]:
+        """Extract valid links from a BeautifulSoup document, lxml tree or streamed page"""
         links = []
-        base_domain = urlparse(base_url).netloc
+        seen = set()
+        base_domain = urlsplit(base_url).netloc.lower()
         
-        for anchor in soup.find_all('a', href=True):
-            href = anchor['href']
-            full_url = urljoin(base_url, str(href))
-            
+        for href in self._absolute_hrefs(document, base_url):
             # Only follow links from same domain
-            if urlparse(full_url).netloc == base_domain:
-                if full_url not in self.visited and full_url not in links:
-                    links.append(full_url)
+            try:
+                if urlsplit(href).netloc.lower() != base_domain:
+                    continue
+            except ValueError:
+                continue
+            
+            full_url = normalize_url(href)
+            if urlsplit(full_url).path.lower().endswith(BINARY_EXTENSIONS):
+                continue
+            if full_url not in self.visited and full_url not in seen:
+                seen.add(full_url)
+                links.append(full_url)
         
         return links
 
@@ -109,76 +345,53 @@ class JSWebCrawler(WebCrawler):
     def __init__(self, config: CrawlConfig, strategy: ExtractionStrategy, js_config: Dict):
         super().__init__(config, strategy)
         self.js_config = js_config
+        self._renderer: Optional[JavaScriptRenderer] = None
     
-    def _crawl_recursive(self, url: str, depth: int):
-        """Recursively crawl pages with JS rendering"""
-        if depth > self.config.max_depth or len(self.results) >= self.config.max_pages:
+    def crawl(self) -> Iterator[CrawlResult]:
+        """Start crawling from the initial URL. Headless pages render in pooled browsers;
+        a headed crawl keeps one browser of its own for every page."""
+        if self.js_config.get('headless', True):
+            yield from super().crawl()
             return
         
-        if url in self.visited:
+        with JavaScriptRenderer(headless=False) as renderer:
+            self._renderer = renderer
+            try:
+                yield from super().crawl()
+            finally:
+                self._renderer = None
+    
+    def _max_workers(self) -> int:
+        # A WebDriver isn't thread-safe, so each worker needs a pooled browser of its own
+        if self._renderer is not None:
+            return 1
+        return max(1, min(self.config.concurrency, browser_pool.pool.pool_size))
+    
+    @contextmanager
+    def _fetch(self, url: str) -> Iterator[Tuple[int, Any, Optional[str]]]:
+        """Render a page with Selenium and yield its final HTML (already text, so no charset)"""
+        if self._renderer is not None:
+            yield self._render(self._renderer, url)
             return
         
-        self.visited.add(url)
-        
+        # The pooled browser goes back before the page is parsed
+        renderer = browser_pool.acquire()
         try:
-            time.sleep(self.config.delay)
-            
-            # Render page with Selenium
-            headless = self.js_config.get('headless', True)
-            wait_config = self.js_config.get('wait')
-            actions = self.js_config.get('actions', [])
-            
-            with JavaScriptRenderer(headless=headless) as renderer:
-                # Load and render page
-                html = renderer.render_page(url, wait_config)
-                
-                # Perform actions
-                for action in actions:
-                    action_type = action.get('type')
-                    
-                    if action_type == 'click':
-                        renderer.click_element(action.get('selector'))
-                    elif action_type == 'scroll':
-                        renderer.scroll_to_bottom(
-                            action.get('pause_time', 1.0),
-                            action.get('max_scrolls', 10)
-                        )
-                    elif action_type == 'script':
-                        renderer.execute_script(action.get('code'))
-                    elif action_type == 'wait':
-                        time.sleep(action.get('seconds', 1))
-                
-                # Get final HTML
-                if renderer.driver:
-                    html = renderer.driver.page_source
-            
-            # Parse and extract
-            soup = BeautifulSoup(html, 'html.parser')
-            data = self.strategy.extract(soup, url)
-            
-            links = []
-            if self.config.follow_links and depth < self.config.max_depth:
-                links = self._extract_links(soup, url)
-            
-            result = CrawlResult(
-                url=url,
-                status_code=200,
-                data=data,
-                links=links
-            )
-            self.results.append(result)
-            
-            # Follow links if configured
-            if self.config.follow_links:
-                for link in links[:5]:
-                    if len(self.results) < self.config.max_pages:
-                        self._crawl_recursive(link, depth + 1)
-            
-        except Exception as e:
-            result = CrawlResult(
-                url=url,
-                status_code=0,
-                data={},
-                error=str(e)
-            )
-            self.results.append(result)
\ No newline at end of file
+            page = self._render(renderer, url)
+        finally:
+            browser_pool.release(renderer)
+        yield page
+    
+    def _render(self, renderer: JavaScriptRenderer, url: str) -> Tuple[int, Any, Optional[str]]:
+        """Load a page, run the configured actions and return the resulting HTML"""
+        wait_config = self.js_config.get('wait')
+        actions = self.js_config.get('actions', [])
+        
+        # Load and render page
+        renderer.render_page(url, wait_config)
+        
+        # Perform actions
+        renderer.perform_actions(actions)
+        
+        # Get final HTML
+        return 200, renderer.get_html(), None
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from typing import Dict, List, Any, Optional
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CrawlConfig:
     """Configuration for crawling behavior"""
     url: str
@@ -9,11 +9,16 @@ class CrawlConfig:
     max_pages: int = 10
     delay: float = 1.0
     follow_links: bool = False
+    max_links_per_page: int = 5
+    concurrency: int = 4
     user_agent: str = "CustomCrawler/1.0"
     timeout: int = 10
     headers: Optional[Dict] = None
+    parser: str = "lxml"
+    debug_log: bool = False
+    debug_log_html: bool = False
 
-@dataclass
+@dataclass(slots=True)
 class CrawlResult:
     """Result from crawling operation"""
     url: str
@@ -1,13 +1,146 @@
 from abc import ABC, abstractmethod
-from bs4 import BeautifulSoup, Tag
-from typing import Dict, List, Any, Optional, Union
+from bs4 import BeautifulSoup, SoupStrainer, Tag, UnicodeDammit
+from bs4.builder import HTMLTreeBuilder
+from typing import Dict, List, Any, Optional, Tuple, Union
+import codecs
+import itertools
 import re
+import soupsieve
+
+try:
+    import lxml.html
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+try:
+    from cssselect import HTMLTranslator, SelectorError
+    LXML_SELECTORS_AVAILABLE = LXML_AVAILABLE
+except ImportError:
+    LXML_SELECTORS_AVAILABLE = False
 
 # ==================== Extraction Strategies ====================
 
+# Class-name patterns used by the product and article heuristics
+_RE_PRODUCT_TITLE = re.compile(r'product.*title', re.I)
+_RE_PRICE = re.compile(r'price', re.I)
+_RE_DESCRIPTION = re.compile(r'description', re.I)
+_RE_PRODUCT_IMG = re.compile(r'product', re.I)
+_RE_AUTHOR = re.compile(r'author', re.I)
+_RE_CONTENT_OR_ARTICLE = re.compile(r'content|article', re.I)
+
+# How much of a byte stream is checked for a declared encoding before parsing starts
+_SNIFF_BYTES = 1024
+_RE_CHARSET = re.compile(rb'charset\s*=', re.I)
+_BOMS = (codecs.BOM_UTF8, codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)
+
+# How much of an undeclared byte stream is held back to guess its encoding
+_DETECT_BYTES = 65536
+
+# Attributes BeautifulSoup returns as lists of tokens, by tag ('*' for every tag)
+_LIST_ATTRIBUTES = HTMLTreeBuilder.DEFAULT_CDATA_LIST_ATTRIBUTES
+
+def decode_html(markup, encoding: Optional[str] = None) -> str:
+    """Decode page bytes the way BeautifulSoup does: the given encoding (e.g. the HTTP charset),
+    BOM or <meta charset>, then detection. Strings are returned unchanged."""
+    if isinstance(markup, str):
+        return markup
+    if not markup:
+        return ''
+    dammit = UnicodeDammit(markup, known_definite_encodings=[encoding] if encoding else [], is_html=True)
+    return dammit.unicode_markup or markup.decode('utf-8', 'replace')
+
+def _guess_encoding(start: bytes) -> str:
+    """Encoding for a stream that declares none: UTF-8 when its start is valid UTF-8, else a detector's guess"""
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(start)  # a split character at the end is fine
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+    guess = UnicodeDammit(start, is_html=True).original_encoding
+    return guess if guess and guess != 'ascii' else 'utf-8'
+
+def parse_html_stream(target, markup, encoding: Optional[str] = None):
+    """Feed markup (bytes, str or an iterable of chunks) to an lxml parser target and return the
+    result of target.close(). `encoding` is the charset from the HTTP header, if any; it loses only
+    to a BOM. Otherwise a <meta charset> in the first bytes is left to libxml2, and streams with no
+    declaration at all are detected from their first _DETECT_BYTES rather than read as Latin-1."""
+    if encoding:
+        try:
+            codecs.lookup(encoding)
+        except LookupError:
+            encoding = None  # a bogus header charset is no better than none
+    chunks = iter([markup] if isinstance(markup, (bytes, str)) else markup)
+    head = list(itertools.islice(chunks, 1))
+
+    def read_head(size: int):
+        while head and isinstance(head[0], bytes) and sum(map(len, head)) < size:
+            chunk = next(chunks, None)
+            if chunk is None:
+                break
+            head.append(chunk)
+
+    read_head(_SNIFF_BYTES)
+    if head and isinstance(head[0], bytes):
+        start = b''.join(head)[:_SNIFF_BYTES]
+        if start.startswith(_BOMS):
+            encoding = None
+        elif not encoding and not _RE_CHARSET.search(start):
+            read_head(_DETECT_BYTES)
+            encoding = _guess_encoding(b''.join(head)[:_DETECT_BYTES])
+    else:
+        encoding = None
+
+    try:
+        html_parser = etree.HTMLParser(target=target, encoding=encoding)
+    except LookupError:
+        # A charset libxml2 doesn't know; let it fall back to the document's own declaration
+        html_parser = etree.HTMLParser(target=target)
+    for chunk in itertools.chain(head, chunks):
+        if chunk:
+            html_parser.feed(chunk)
+    try:
+        return html_parser.close()
+    except etree.XMLSyntaxError:
+        # Nothing parseable was fed (e.g. an empty body)
+        return target.close()
+
+class _AnyOfStrainer(SoupStrainer):
+    """SoupStrainer that keeps a tag when any of the wrapped strainers would keep it"""
+    
+    def __init__(self, *strainers: SoupStrainer):
+        super().__init__()
+        self.strainers = strainers
+    
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        return any(strainer.allow_tag_creation(nsprefix, name, attrs) for strainer in self.strainers)
+    
+    def allow_string_creation(self, string: str) -> bool:
+        # Only keep text that lives inside a matched tag
+        return False
+
 class ExtractionStrategy(ABC):
     """Base class for extraction strategies"""
     
+    # Parts of the page the strategy looks at; None parses the whole document
+    PARSE_ONLY: Optional[SoupStrainer] = None
+    
+    # Streaming strategies also accept an iterable of byte chunks in parse()
+    STREAMING = False
+    
+    def parse(self, markup, parser: str, encoding: Optional[str] = None) -> Any:
+        """Parse raw page markup into the document that extract() expects.
+        encoding is the charset the server declared for byte markup, if any."""
+        from_encoding = encoding if isinstance(markup, bytes) else None
+        return BeautifulSoup(markup, parser, parse_only=self.PARSE_ONLY, from_encoding=from_encoding)
+    
     @abstractmethod
     def extract(self, soup: BeautifulSoup, url: str) -> Dict[str, Any]:
         """Extract data from BeautifulSoup object"""
@@ -16,6 +149,8 @@ class ExtractionStrategy(ABC):
 class GenericStrategy(ExtractionStrategy):
     """Generic extraction - gets common elements"""
     
+    PARSE_ONLY = SoupStrainer(['title', 'h1', 'h2', 'h3', 'p', 'img', 'meta'])
+    
     def extract(self, soup: BeautifulSoup, url: str) -> Dict[str, Any]:
         return {
             'title': soup.title.string if soup.title else None,
@@ -35,6 +170,158 @@ class GenericStrategy(ExtractionStrategy):
             return content
         return None
 
+class StreamedPage:
+    """What a tree-less strategy keeps of a page: the extracted fields and the anchors' hrefs"""
+    
+    def __init__(self, data: Dict[str, Any], hrefs: List[str]):
+        self.data = data
+        self.hrefs = hrefs
+
+class StreamingExtractionStrategy(ExtractionStrategy):
+    """Base class for strategies that extract from parser events while the page streams in,
+    so no document tree is ever built. Subclasses supply an lxml parser target per page."""
+    
+    STREAMING = True
+    
+    @abstractmethod
+    def create_target(self):
+        """Return a fresh lxml parser target whose close() returns a StreamedPage"""
+        pass
+    
+    def parse(self, markup, parser: str, encoding: Optional[str] = None) -> StreamedPage:
+        return parse_html_stream(self.create_target(), markup, encoding)
+    
+    def extract(self, page: StreamedPage, url: str) -> Dict[str, Any]:
+        return page.data
+
+class _GenericTarget:
+    """Parser target collecting GenericStrategy's fields and the page's links"""
+    
+    TEXT_TAGS = ('title', 'h1', 'h2', 'h3', 'p')
+    
+    def __init__(self):
+        self.title: Optional[str] = None
+        self.headings: List[str] = []
+        self.paragraphs: List[str] = []
+        self.images: List[Optional[str]] = []
+        self.metas: Dict[Tuple[str, str], Optional[str]] = {}
+        self.hrefs: List[str] = []
+        self._open: List[Tuple[str, List[str], int]] = []  # (tag, text parts, result index)
+        self._pending: List[str] = []
+        self._in_script = 0
+        self._seen_title = False
+    
+    def _flush(self):
+        # Text nodes can arrive in pieces; strip them whole, like get_text(strip=True)
+        if not self._pending:
+            return
+        text = ''.join(self._pending)
+        self._pending = []
+        stripped = text.strip()
+        for tag, parts, _ in self._open:
+            if tag == 'title':
+                parts.append(text)
+            elif stripped:
+                parts.append(stripped)
+    
+    def start(self, tag, attrib):
+        self._flush()
+        if tag in ('script', 'style'):
+            self._in_script += 1
+        elif tag in self.TEXT_TAGS:
+            if tag == 'p':
+                index = len(self.paragraphs)
+                self.paragraphs.append('')
+            elif tag == 'title':
+                index = -1 if self._seen_title else 0
+                self._seen_title = True
+            else:
+                index = len(self.headings)
+                self.headings.append('')
+            self._open.append((tag, [], index))
+        elif tag == 'img':
+            self.images.append(attrib.get('src') or attrib.get('data-src'))
+        elif tag == 'meta':
+            for attr in ('name', 'property'):
+                if attr in attrib:
+                    self.metas.setdefault((attr, attrib[attr]), attrib.get('content'))
+        elif tag == 'a' and 'href' in attrib:
+            self.hrefs.append(attrib['href'])
+    
+    def end(self, tag):
+        self._flush()
+        if tag in ('script', 'style'):
+            self._in_script = max(0, self._in_script - 1)
+        elif self._open and self._open[-1][0] == tag:
+            _, parts, index = self._open.pop()
+            if tag == 'p':
+                self.paragraphs[index] = ''.join(parts)
+            elif tag == 'title':
+                if index == 0:
+                    self.title = ''.join(parts) or None
+            else:
+                self.headings[index] = ''.join(parts)
+    
+    def data(self, text):
+        if not self._in_script:
+            self._pending.append(text)
+    
+    def comment(self, text):
+        # A comment splits the surrounding text into separate strings
+        self._flush()
+    
+    def close(self) -> StreamedPage:
+        self._flush()
+        return StreamedPage({
+            'title': self.title,
+            'headings': self.headings,
+            'paragraphs': self.paragraphs[:5],
+            'images': self.images,
+            'meta_description': self._meta('description'),
+            'meta_keywords': self._meta('keywords')
+        }, self.hrefs)
+    
+    def _meta(self, name: str) -> Optional[str]:
+        for key in (('name', name), ('property', f'og:{name}')):
+            if key in self.metas:
+                return self.metas[key]
+        return None
+
+class StreamingGenericStrategy(StreamingExtractionStrategy):
+    """GenericStrategy fields, extracted from parser events instead of a parsed tree"""
+    
+    def create_target(self) -> _GenericTarget:
+        return _GenericTarget()
+
+class GenericStrategyFast(ExtractionStrategy):
+    """GenericStrategy fields, extracted with selectolax"""
+    
+    def parse(self, markup, parser: str, encoding: Optional[str] = None) -> StreamedPage:
+        # lexbor reads bytes as UTF-8 whatever the page declares, so decode first
+        tree = LexborHTMLParser(decode_html(markup, encoding))
+        for node in tree.css('script, style'):
+            node.decompose()
+        
+        title = tree.css_first('title')
+        return StreamedPage({
+            'title': (title.text() or None) if title else None,
+            'headings': [h.text(strip=True) for h in tree.css('h1, h2, h3')],
+            'paragraphs': [p.text(strip=True) for p in tree.css('p')[:5]],
+            'images': [img.attributes.get('src') or img.attributes.get('data-src') for img in tree.css('img')],
+            'meta_description': self._get_meta(tree, 'description'),
+            'meta_keywords': self._get_meta(tree, 'keywords')
+        }, [a.attributes['href'] for a in tree.css('a[href]') if a.attributes['href'] is not None])
+    
+    def extract(self, page: StreamedPage, url: str) -> Dict[str, Any]:
+        return page.data
+    
+    def _get_meta(self, tree, name: str) -> Optional[str]:
+        for attr, value in (('name', name), ('property', f'og:{name}')):
+            for meta in tree.css('meta'):
+                if meta.attributes.get(attr) == value:
+                    return meta.attributes.get('content')
+        return None
+
 class SelectorStrategy(ExtractionStrategy):
     """CSS selector-based extraction with advanced attribute support"""
     
@@ -85,6 +372,66 @@ class SelectorStrategy(ExtractionStrategy):
           }
         """
         self.selectors = selectors
+        self._compiled: Dict[str, Any] = {}
+        self._resolved: Dict[str, Tuple[str, Optional[str]]] = {}
+        self._columns: Dict[int, List[Tuple]] = {}
+        for config in selectors.values():
+            self._prepare_field(config)
+    
+    def _prepare_field(self, config: Any):
+        """Resolve a field's selectors up front instead of re-splitting them on every page"""
+        if isinstance(config, str):
+            self._prepare_selector(self._resolve(config)[0])
+        elif isinstance(config, dict) and config.get('selector'):
+            self._prepare_selector(config['selector'])
+            if 'child' in config:
+                self._prepare_selector(config['child'])
+            if config.get('extract', 'text') == 'table':
+                columns = [self._prepare_column(idx, col_config) for idx, col_config in enumerate(config.get('columns', []))]
+                self._columns[id(config)] = columns
+                for _, css_selector, _, col_config in columns:
+                    if css_selector:
+                        self._prepare_selector(css_selector)
+                    if col_config and 'child' in col_config:
+                        self._prepare_selector(col_config['child'])
+    
+    def _prepare_column(self, idx: int, col_config: Any) -> Tuple[str, Optional[str], Optional[str], Optional[Dict]]:
+        """Resolve a table column into (key, css selector, attribute, element config)"""
+        if isinstance(col_config, dict) and 'name' in col_config:
+            key = col_config['name']
+        else:
+            key = f"column_{idx}"
+        
+        if isinstance(col_config, str):
+            css_selector, attribute = self._resolve(col_config)
+            return key, css_selector, attribute, None
+        if isinstance(col_config, dict) and col_config.get('selector'):
+            css_selector, attribute = self._resolve(col_config['selector'])
+            return key, css_selector, attribute, {**col_config, 'multiple': False}
+        return key, None, None, None
+    
+    def _resolve(self, selector: str) -> Tuple[str, Optional[str]]:
+        """Split a 'css@attribute' selector into its parts, once per selector string"""
+        resolved = self._resolved.get(selector)
+        if resolved is None:
+            if '@' in selector:
+                css_selector, attribute = selector.split('@', 1)
+                resolved = (css_selector.strip(), attribute.strip())
+            else:
+                resolved = (selector, None)
+            self._resolved[selector] = resolved
+        return resolved
+    
+    def _compile(self, css: str):
+        """Compile a CSS selector with soupsieve once and reuse it on every page"""
+        compiled = self._compiled.get(css)
+        if compiled is None:
+            compiled = self._compiled[css] = soupsieve.compile(css)
+        return compiled
+    
+    def _prepare_selector(self, css: str):
+        """Compile selectors ahead of time, so a bad one fails before any page is fetched"""
+        self._compile(css)
     
     def extract(self, soup: BeautifulSoup, url: str) -> Dict[str, Any]:
         result = {}
@@ -108,25 +455,23 @@ class SelectorStrategy(ExtractionStrategy):
     def _extract_simple(self, soup: Union[BeautifulSoup, Tag], selector: str) -> Any:
         """Extract using simple string selector (text or attribute)"""
         
+        css_selector, attribute = self._resolve(selector)
+        elements = self._select(soup, css_selector)
+        
         # Check if attribute extraction is specified
-        if '@' in selector:
-            css_selector, attribute = selector.split('@', 1)
-            elements = soup.select(css_selector.strip())
-            
+        if attribute is not None:
             if len(elements) == 1:
-                return elements[0].get(attribute.strip())
+                return self._attr(elements[0], attribute)
             elif len(elements) > 1:
-                return [el.get(attribute.strip()) for el in elements]
+                return [self._attr(el, attribute) for el in elements]
             else:
                 return None
         else:
             # Extract text content
-            elements = soup.select(selector)
-            
             if len(elements) == 1:
-                return elements[0].get_text(strip=True)
+                return self._text(elements[0])
             elif len(elements) > 1:
-                return [el.get_text(strip=True) for el in elements]
+                return [self._text(el) for el in elements]
             else:
                 return None
     
@@ -145,7 +490,7 @@ class SelectorStrategy(ExtractionStrategy):
             return self._extract_table(soup, config)
         
         # Find elements
-        elements = soup.select(selector)
+        elements = self._select(soup, selector)
         
         if not elements:
             return None
@@ -177,23 +522,23 @@ class SelectorStrategy(ExtractionStrategy):
         # Handle child element selection first
         if 'child' in config:
             child_selector = config['child']
-            child = element.select_one(child_selector)
-            if child:
+            child = self._select_one(element, child_selector)
+            if child is not None:
                 element = child
             else:
                 return None
         
         # Extract based on type
         if extract_type == 'text':
-            return element.get_text(strip=True)
+            return self._text(element)
         
         elif extract_type == 'html':
-            return str(element)
+            return self._html(element)
         
         elif extract_type == 'attr':
             attribute = config.get('attribute')
             if attribute:
-                return element.get(attribute)
+                return self._attr(element, attribute)
             return None
         
         elif extract_type == 'child_attr':
@@ -201,9 +546,9 @@ class SelectorStrategy(ExtractionStrategy):
             child_selector = config.get('child', '*')
             attribute = config.get('child_attribute')
             if attribute:
-                child = element.select_one(child_selector)
-                if child:
-                    return child.get(attribute)
+                child = self._select_one(element, child_selector)
+                if child is not None:
+                    return self._attr(child, attribute)
             return None
         
         return None
@@ -217,79 +562,144 @@ class SelectorStrategy(ExtractionStrategy):
         if not columns or not selector:
             return []
         
+        # Columns are resolved when the strategy is configured, not per row
+        prepared = self._columns.get(id(config))
+        if prepared is None:
+            prepared = [self._prepare_column(idx, col_config) for idx, col_config in enumerate(columns)]
+        
         # Find all rows
-        rows = soup.select(selector)
+        rows = self._select(soup, selector)
         
         results = []
         for row in rows:
             row_data = {}
             
-            for idx, col_config in enumerate(columns):
-                # Generate key name
-                if isinstance(col_config, dict) and 'name' in col_config:
-                    key = col_config['name']
-                else:
-                    key = f"column_{idx}"
+            for key, css_selector, attribute, col_config in prepared:
+                element = self._select_one(row, css_selector) if css_selector else None
                 
-                # Extract column data
-                if isinstance(col_config, str):
-                    # Simple string selector - handle @ syntax
-                    if '@' in col_config:
-                        # Split selector and attribute
-                        css_selector, attribute = col_config.split('@', 1)
-                        element = row.select_one(css_selector.strip())
-                        value = element.get(attribute.strip()) if element else None
-                    else:
-                        # Regular text extraction
-                        element = row.select_one(col_config)
-                        value = element.get_text(strip=True) if element else None
-                elif isinstance(col_config, dict):
-                    col_selector = col_config.get('selector')
-                    if col_selector:
-                        # Check if selector has @ syntax
-                        if '@' in col_selector:
-                            css_selector, attribute = col_selector.split('@', 1)
-                            element = row.select_one(css_selector.strip())
-                            value = element.get(attribute.strip()) if element else None
-                        else:
-                            # Use element-based extraction for other types
-                            element = row.select_one(col_selector)
-                            if element:
-                                single_config = {**col_config, 'multiple': False}
-                                value = self._extract_from_element(element, single_config)
-                            else:
-                                value = None
-                else:
+                if element is None:
                     value = None
+                elif attribute is not None:
+                    # Selector used @ syntax
+                    value = self._attr(element, attribute)
+                elif col_config is not None:
+                    # Use element-based extraction for other types
+                    value = self._extract_from_element(element, col_config)
+                else:
+                    # Regular text extraction
+                    value = self._text(element)
                 
                 row_data[key] = value
             
             results.append(row_data)
         
         return results
+    
+    # Document access, overridden by LxmlSelectorStrategy
+    
+    def _select(self, node, css: str) -> List:
+        return self._compile(css).select(node)
+    
+    def _select_one(self, node, css: str):
+        return self._compile(css).select_one(node)
+    
+    def _text(self, element) -> str:
+        return element.get_text(strip=True)
+    
+    def _attr(self, element, name: str):
+        return element.get(name)
+    
+    def _html(self, element) -> str:
+        return str(element)
+
+# Elements whose strings BeautifulSoup's get_text() skips unless the element itself is selected
+_HIDDEN_TEXT = 'self::script or self::style or self::template'
+
+class LxmlSelectorStrategy(SelectorStrategy):
+    """SelectorStrategy that runs on a raw lxml tree with compiled, cached CSS selectors"""
+    
+    def __init__(self, selectors: Dict[str, Any]):
+        """Compiles every selector up front; raises ValueError if cssselect can't handle one"""
+        self._translator = HTMLTranslator()
+        # Text nodes as BeautifulSoup's get_text() sees them: script, style and template source is left
+        # out, except when the selected element is the script, style or template itself
+        self._text_nodes = etree.XPath('descendant-or-self::text()[count(ancestor::*[%s]) = $hidden]' % _HIDDEN_TEXT)
+        self._hidden = etree.XPath('count(self::*[%s])' % _HIDDEN_TEXT)
+        super().__init__(selectors)
+    
+    def parse(self, markup, parser: str, encoding: Optional[str] = None) -> Any:
+        # Decode as BeautifulSoup would, then hand lxml UTF-8 with the encoding pinned: this avoids
+        # libxml2's Latin-1 default for undeclared bytes, and str input with an XML encoding declaration
+        html = decode_html(markup, encoding).encode('utf-8')
+        try:
+            return lxml.html.document_fromstring(html, parser=lxml.html.HTMLParser(encoding='utf-8')).getroottree()
+        except etree.ParserError:
+            # Empty documents have no root element
+            return lxml.html.document_fromstring('<html></html>').getroottree()
+    
+    def _compile(self, css: str):
+        """Translate a CSS selector to XPath once and reuse it on every page"""
+        compiled = self._compiled.get(css)
+        if compiled is None:
+            compiled = self._compiled[css] = etree.XPath(self._translator.css_to_xpath(css))
+        return compiled
+    
+    def _prepare_selector(self, css: str):
+        try:
+            self._compile(css)
+        except SelectorError as e:
+            raise ValueError(f"Selector not supported by lxml: {css} ({e})")
+    
+    def _select(self, node, css: str) -> List:
+        # Like soupsieve, only match below the node, never the node itself
+        return [el for el in self._compile(css)(node) if el is not node]
+    
+    def _select_one(self, node, css: str):
+        elements = self._select(node, css)
+        return elements[0] if elements else None
+    
+    def _text(self, element) -> str:
+        return ''.join(text.strip() for text in self._text_nodes(element, hidden=self._hidden(element)))
+    
+    def _attr(self, element, name: str):
+        # Multi-valued attributes (class, rel, ...) come back as lists, like BeautifulSoup's
+        value = element.get(name)
+        if value is not None and (name in _LIST_ATTRIBUTES['*'] or name in _LIST_ATTRIBUTES.get(element.tag, ())):
+            return value.split()
+        return value
+    
+    def _html(self, element) -> str:
+        # Round-trip through BeautifulSoup so the markup reads as str(tag) would (<br/>, disabled="", ...)
+        html = lxml.html.tostring(element, encoding='unicode', with_tail=False)
+        return str(BeautifulSoup(html, 'html.parser').contents[0])
 
 class ProductStrategy(ExtractionStrategy):
     """E-commerce product extraction"""
     
+    PARSE_ONLY = _AnyOfStrainer(
+        SoupStrainer(attrs={'itemprop': True}),
+        SoupStrainer(class_=[_RE_PRODUCT_IMG, _RE_PRICE, _RE_DESCRIPTION])
+    )
+    
     def extract(self, soup: BeautifulSoup, url: str) -> Dict[str, Any]:
         return {
             'product_name': self._find_by_patterns(soup, [
                 {'itemprop': 'name'},
-                {'class_': re.compile(r'product.*title', re.I)}
+                {'class_': _RE_PRODUCT_TITLE}
             ]),
             'price': self._find_by_patterns(soup, [
                 {'itemprop': 'price'},
-                {'class_': re.compile(r'price', re.I)}
+                {'class_': _RE_PRICE}
             ]),
             'description': self._find_by_patterns(soup, [
                 {'itemprop': 'description'},
-                {'class_': re.compile(r'description', re.I)}
+                {'class_': _RE_DESCRIPTION}
             ]),
             'availability': self._find_by_patterns(soup, [
                 {'itemprop': 'availability'}
             ]),
             'images': [img.get('src') or img.get('data-src') 
-                      for img in soup.find_all('img', class_=re.compile(r'product', re.I))]
+                      for img in soup.find_all('img', class_=_RE_PRODUCT_IMG)]
         }
     
     def _find_by_patterns(self, soup: BeautifulSoup, patterns: List[Dict]) -> Optional[str]:
@@ -302,6 +712,11 @@ class ProductStrategy(ExtractionStrategy):
 class ArticleStrategy(ExtractionStrategy):
     """News article/blog extraction"""
     
+    PARSE_ONLY = _AnyOfStrainer(
+        SoupStrainer(['title', 'h1', 'article', 'time', 'meta', 'p']),
+        SoupStrainer(class_=[_RE_AUTHOR, _RE_CONTENT_OR_ARTICLE])
+    )
+    
     def extract(self, soup: BeautifulSoup, url: str) -> Dict[str, Any]:
         return {
             'headline': self._get_headline(soup),
@@ -324,7 +739,7 @@ class ArticleStrategy(ExtractionStrategy):
             if isinstance(content, list):
                 return content[0] if content else None
             return content
-        author = soup.find(class_=re.compile(r'author', re.I))
+        author = soup.find(class_=_RE_AUTHOR)
         return author.get_text(strip=True) if author else None
     
     def _get_date(self, soup: BeautifulSoup) -> Optional[str]:
@@ -337,7 +752,7 @@ class ArticleStrategy(ExtractionStrategy):
         return None
     
     def _get_content(self, soup: BeautifulSoup) -> List[str]:
-        article = soup.find('article') or soup.find(class_=re.compile(r'content|article', re.I))
+        article = soup.find('article') or soup.find(class_=_RE_CONTENT_OR_ARTICLE)
         if article:
             return [p.get_text(strip=True) for p in article.find_all('p')]
         return [p.get_text(strip=True) for p in soup.find_all('p')]
@@ -1,4 +1,5 @@
-from typing import Dict, Any, Optional
+from typing import Dict, List, Any, Optional
+import json
 import time
 
 # Selenium imports
@@ -9,10 +10,51 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, JavascriptException
 
 # ==================== JavaScript Renderer ====================
 
+# Path returned by ChromeDriverManager, resolved once per process
+_CACHED_DRIVER_PATH: Optional[str] = None
+
+def _chromedriver_path() -> str:
+    """Resolve the ChromeDriver binary, only asking ChromeDriverManager the first time"""
+    global _CACHED_DRIVER_PATH
+    if _CACHED_DRIVER_PATH is None:
+        _CACHED_DRIVER_PATH = ChromeDriverManager().install()
+    return _CACHED_DRIVER_PATH
+
+# Runs a batch of action steps in the page; passes back the click selectors that never appeared
+_ACTIONS_PROGRAM = """
+const done = arguments[arguments.length - 1];
+const sleep = ms => new Promise(resolve => setTimeout(resolve, ms));
+const missing = [];
+async function click(selector, timeout) {
+    const deadline = Date.now() + timeout;
+    let element = document.querySelector(selector);
+    while (!element && Date.now() < deadline) {
+        await sleep(100);
+        element = document.querySelector(selector);
+    }
+    if (!element) { missing.push(selector); return; }
+    element.click();
+    await sleep(1000);
+}
+async function scroll(pause, maxScrolls) {
+    let lastHeight = document.body.scrollHeight;
+    for (let i = 0; i < maxScrolls; i++) {
+        window.scrollTo(0, document.body.scrollHeight);
+        await sleep(pause);
+        const newHeight = document.body.scrollHeight;
+        if (newHeight === lastHeight) break;
+        lastHeight = newHeight;
+    }
+}
+(async () => {
+%s
+})().then(() => done({missing: missing}), error => done({error: String(error)}));
+"""
+
 class JavaScriptRenderer:
     """Handles rendering of JavaScript-heavy pages using Selenium"""
     
@@ -23,13 +65,36 @@ class JavaScriptRenderer:
     
     def __enter__(self):
         """Context manager entry - initialize driver"""
-        self.driver = self._create_driver()
-        return self
+        return self.open()
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit - cleanup driver"""
+        self.close()
+    
+    def open(self) -> 'JavaScriptRenderer':
+        """Start the browser; for renderers that outlive a single with-block (see browser_pool)"""
+        if not self.driver:
+            self.driver = self._create_driver()
+        return self
+    
+    def close(self):
+        """Quit the browser"""
         if self.driver:
             self.driver.quit()
+            self.driver = None
+    
+    def reset(self):
+        """Clear cookies and swap to a fresh tab so the next page starts from a clean state"""
+        if not self.driver:
+            raise RuntimeError("Driver not initialized")
+        
+        self.driver.delete_all_cookies()
+        old_tab = self.driver.current_window_handle
+        self.driver.switch_to.new_window('tab')
+        new_tab = self.driver.current_window_handle
+        self.driver.switch_to.window(old_tab)
+        self.driver.close()
+        self.driver.switch_to.window(new_tab)
     
     def _create_driver(self):
         """Create and configure Chrome WebDriver"""
@@ -45,7 +110,7 @@ class JavaScriptRenderer:
         chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
         
         # Install and setup ChromeDriver automatically
-        service = Service(ChromeDriverManager().install())
+        service = Service(_chromedriver_path())
         driver = webdriver.Chrome(service=service, options=chrome_options)
         driver.set_page_load_timeout(30)
         
@@ -79,6 +144,12 @@ class JavaScriptRenderer:
         # Return rendered HTML
         return self.driver.page_source
     
+    def get_html(self) -> str:
+        """Return the current DOM as HTML without navigating, so action side effects are kept"""
+        if not self.driver:
+            raise RuntimeError("Driver not initialized")
+        return self.driver.page_source
+    
     def _wait_for_content(self, wait_config: Dict):
         """Wait for content based on configuration"""
         if not self.driver:
@@ -138,6 +209,80 @@ class JavaScriptRenderer:
         except (TimeoutException, NoSuchElementException) as e:
             print(f"Could not click element {selector}: {e}")
     
+    def perform_actions(self, actions: List[Dict]):
+        """
+        Run the request's actions (click, scroll, script, wait) against the loaded page.
+        Consecutive actions are sent as one async script instead of a WebDriver call each;
+        a click with "native": true is a real WebDriver click and ends the batch. Script actions end
+        it too: a run of them goes through one execute_script, each keeping its own arguments and return.
+        """
+        if not self.driver:
+            raise RuntimeError("Driver not initialized")
+        
+        steps: List[str] = []
+        budget = 0.0  # seconds the batch may take, for the script timeout
+        scripts: List[str] = []  # consecutive script actions, sent together
+        
+        for action in actions:
+            action_type = action.get('type')
+            if action_type != 'script' and scripts:
+                self._run_scripts(scripts)
+                scripts = []
+            
+            if action_type == 'click':
+                selector = action.get('selector')
+                if not selector:
+                    continue
+                if action.get('native'):
+                    self._run_actions(steps, budget)
+                    steps, budget = [], 0.0
+                    self.click_element(selector)
+                else:
+                    steps.append(f"await click({json.dumps(selector)}, {self.wait_time * 1000});")
+                    budget += self.wait_time + 1
+            
+            elif action_type == 'scroll':
+                pause_time = action.get('pause_time', 1.0)
+                max_scrolls = action.get('max_scrolls', 10)
+                steps.append(f"await scroll({pause_time * 1000}, {int(max_scrolls)});")
+                budget += pause_time * max_scrolls
+            
+            elif action_type == 'script':
+                script = action.get('code')
+                if script:
+                    self._run_actions(steps, budget)
+                    steps, budget = [], 0.0
+                    scripts.append(script)
+            
+            elif action_type == 'wait':
+                seconds = action.get('seconds', 1)
+                steps.append(f"await sleep({seconds * 1000});")
+                budget += seconds
+        
+        self._run_actions(steps, budget)
+        self._run_scripts(scripts)
+    
+    def _run_scripts(self, scripts: List[str]):
+        """Run user scripts in one execute_script call, each in its own function as if sent alone"""
+        if not scripts:
+            return
+        
+        self.execute_script("\n".join(
+            f"(function () {{\n{script}\n}}).apply(this, arguments);" for script in scripts
+        ))
+    
+    def _run_actions(self, steps: List[str], budget: float):
+        """Execute a batch of action steps in one round trip"""
+        if not steps:
+            return
+        
+        self.driver.set_script_timeout(budget + 30)
+        result = self.driver.execute_async_script(_ACTIONS_PROGRAM % "\n".join(steps)) or {}
+        if result.get('error'):
+            raise JavascriptException(result['error'])
+        for selector in result.get('missing', []):
+            print(f"Could not click element {selector}: not found")
+    
     def scroll_to_bottom(self, pause_time: float = 1.0, max_scrolls: int = 10):
         """Scroll to bottom of page (useful for infinite scroll)"""
         if not self.driver:
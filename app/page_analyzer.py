@@ -1,19 +1,311 @@
-from typing import Dict, List, Any, Optional
-from bs4 import BeautifulSoup
-import json
+from typing import Dict, List, Any, Optional, Tuple
+from collections import defaultdict
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+import functools
 import re
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+# Modules
+from app.extraction_strategies import LXML_AVAILABLE, parse_html_stream
+
 # ==================== Page Analyzer ====================
 
+# Text patterns, compiled once rather than on every analyze() call
+_PRICE_RE = re.compile(r'[$£€¥]|\d+[.,]\d{2}')  # a currency symbol or an amount like 9.99
+
+# Lowercase substrings looked up in the class index; each group is tried keyword by keyword
+_MAIN_CLASSES = ('content', 'main', 'article', 'post')
+_PRICE_CLASSES = ('price', 'cost', 'amount')
+_DATE_CLASSES = ('date', 'published')
+_AUTHOR_CLASSES = ('author', 'byline')
+
+# Classes too common to identify an element in a generated selector
+_GENERIC_CLASSES = frozenset(('container', 'wrapper', 'content'))
+
+_HEADING_TAGS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+_SEMANTIC_TAGS = ('header', 'footer', 'nav', 'main', 'article', 'section', 'aside')
+
+# 'full' runs every analysis; 'meta' parses only the head tags and reports metadata alone
+ANALYSIS_MODES = ('full', 'meta')
+_META_TAGS = ('meta', 'title', 'script')
+_META_STRAINER = SoupStrainer(list(_META_TAGS))
+
+# Tags whose elements the analysis reads; every other tag is only counted
+# Classed images offered as selector suggestions
+_SUGGESTED_IMAGES = 3
+
+_KEPT_TAGS = frozenset(('title', 'main', 'article', 'nav', 'time') + _HEADING_TAGS)
+
+# Tags a streamed analysis keeps records for (besides classed, itemprop="price" and ld+json elements)
+_STREAM_TAGS = _KEPT_TAGS | {'meta'}
+# Streamed elements whose text the analysis reads, and how much of it is kept
+_STREAM_TEXT_TAGS = frozenset(('time',) + _HEADING_TAGS)
+_STREAM_TEXT_LIMIT = 200
+
+def _memoized(method):
+    """Cache a no-argument analyzer method's result for the lifetime of the analyzer"""
+    @functools.wraps(method)
+    def wrapper(self):
+        if method.__name__ not in self._cache:
+            self._cache[method.__name__] = method(self)
+        return self._cache[method.__name__]
+    return wrapper
+
+class _StreamedElement:
+    """Stand-in for a Tag in a streamed analysis: the tag name, its attributes and (capped) text"""
+    
+    __slots__ = ('name', 'attrs', 'keeps_text', 'text', 'string', 'link_count')
+    
+    def __init__(self, name: str, attrs: Dict[str, Any], keeps_text: bool):
+        self.name = name
+        self.attrs = attrs
+        self.keeps_text = keeps_text
+        self.text = ''  # like get_text(strip=True), when keeps_text is set
+        self.string: Optional[str] = None  # raw text, kept for <title> and ld+json scripts
+        self.link_count = 0  # <a> descendants, counted for <nav>
+    
+    def get(self, key: str, default=None):
+        return self.attrs.get(key, default)
+    
+    def has_attr(self, key: str) -> bool:
+        return key in self.attrs
+    
+    def get_text(self, separator: str = '', strip: bool = False) -> str:
+        return self.text
+
+class _AnalyzerTarget:
+    """lxml parser target feeding a PageAnalyzer's buckets from parser events, without building a tree"""
+    
+    def __init__(self, analyzer: 'PageAnalyzer'):
+        self.analyzer = analyzer
+        self._open: List[Tuple[str, Optional[_StreamedElement]]] = []
+        self._pending: List[str] = []
+        self._page_text: List[str] = []
+        self._in_script = 0
+        # Like _META_STRAINER: in 'meta' mode every other tag is passed over without being recorded
+        # (meta, title and script hold no elements, so nothing is lost from the open-element stack)
+        self._meta_only = analyzer.mode == 'meta'
+    
+    def _flush(self):
+        # Text nodes can arrive in pieces; strip them whole, like get_text(strip=True)
+        if not self._pending:
+            return
+        text = ''.join(self._pending)
+        self._pending = []
+        stripped = text.strip()
+        if stripped and not self._in_script and not self._meta_only:
+            self._page_text.append(stripped)
+        
+        for _, record in self._open:
+            if record is None:
+                continue
+            if record.string is not None:
+                record.string += text
+            elif record.keeps_text and stripped and not self._in_script and len(record.text) < _STREAM_TEXT_LIMIT:
+                record.text = (record.text + stripped)[:_STREAM_TEXT_LIMIT]
+    
+    def start(self, tag, attrib):
+        self._flush()
+        if self._meta_only and tag not in _META_TAGS:
+            return
+        attrs = dict(attrib)
+        if 'class' in attrs:
+            attrs['class'] = attrs['class'].split()
+        
+        record = None
+        classed_or_price = bool(attrs.get('class')) or attrs.get('itemprop') == 'price'
+        ld_json = tag == 'script' and attrs.get('type') == 'application/ld+json'
+        if tag in _STREAM_TAGS or classed_or_price or ld_json or (tag == 'img' and 'class' in attrs):
+            record = _StreamedElement(tag, attrs, classed_or_price or tag in _STREAM_TEXT_TAGS)
+            if tag == 'title' or ld_json:
+                record.string = ''
+            self.analyzer._add_element(record)
+        else:
+            self.analyzer._tag_counts[tag] += 1
+        
+        if tag == 'a':
+            for name, open_record in self._open:
+                if name == 'nav' and open_record is not None:
+                    open_record.link_count += 1
+        if tag in ('script', 'style'):
+            self._in_script += 1
+        self._open.append((tag, record))
+    
+    def end(self, tag):
+        self._flush()
+        if self._meta_only and tag not in _META_TAGS:
+            return
+        while self._open:
+            name, record = self._open.pop()
+            if name in ('script', 'style'):
+                self._in_script = max(0, self._in_script - 1)
+            if record is not None and record.string == '':
+                record.string = None
+            if name == tag:
+                break
+    
+    def data(self, text):
+        self._pending.append(text)
+    
+    def comment(self, text):
+        # A comment splits the surrounding text into separate strings
+        self._flush()
+    
+    def close(self):
+        self._flush()
+        self.analyzer.set_page_text(' '.join(self._page_text))
+
 class PageAnalyzer:
     """Analyzes webpage structure to suggest extraction strategies"""
     
-    def __init__(self, soup: BeautifulSoup, url: str):
+    def __init__(self, soup: BeautifulSoup, url: str, mode: str = 'full'):
+        if mode not in ANALYSIS_MODES:
+            raise ValueError(f"Unknown analysis mode: {mode}")
         self.soup = soup
         self.url = url
+        self.mode = mode
+        self._cache: Dict[str, Any] = {}
+        self._texts: Dict[int, str] = {}  # id(element) -> get_text(strip=True)
+        self._page_text: Optional[str] = None  # set when there's no soup to read the text from
+        self._reset_buckets()
+        if soup is not None:
+            self._collect_buckets()
+    
+    @classmethod
+    def from_html(cls, html, url: str, mode: str = 'full', parser: str = 'lxml',
+                  encoding: Optional[str] = None) -> 'PageAnalyzer':
+        """Parse raw HTML for analysis. mode='meta' parses only <meta>, <title> and <script> tags,
+        which is much cheaper but leaves structure, content hints and suggestions unavailable.
+        encoding is the charset the server declared for byte input, if any."""
+        parse_only = _META_STRAINER if mode == 'meta' else None
+        from_encoding = encoding if isinstance(html, bytes) else None
+        return cls(BeautifulSoup(html, parser, parse_only=parse_only, from_encoding=from_encoding), url, mode)
+    
+    @classmethod
+    def analyze_stream(cls, chunks, url: str, mode: str = 'full', encoding: Optional[str] = None) -> Dict[str, Any]:
+        """Analyze a page from an iterable of byte chunks (e.g. response.iter_content()) as it arrives.
+        encoding is the charset from the HTTP header, if the server sent one.
+        No document tree is built; elements are kept only as small records, with text capped at
+        _STREAM_TEXT_LIMIT characters, so heuristics on very long texts can differ from analyze()."""
+        if not LXML_AVAILABLE:
+            raise ImportError("lxml is required for streamed analysis")
+        
+        analyzer = cls(None, url, mode)
+        parse_html_stream(_AnalyzerTarget(analyzer), chunks, encoding)
+        analyzer._parse_ld_json()
+        return analyzer.analyze()
+    
+    def _reset_buckets(self):
+        """Start with empty buckets"""
+        self._tag_counts: Dict[str, int] = defaultdict(int)
+        self._tags_by_name: Dict[str, List[Tag]] = defaultdict(list)  # only for _KEPT_TAGS
+        self._classed_images: List[Tag] = []  # the first _SUGGESTED_IMAGES only
+        self._classed: List[Tuple[Tag, List[str]]] = []  # (element, classes) in document order
+        self._class_index: Dict[str, List[int]] = defaultdict(list)  # lowercased class -> positions in _classed
+        self._lowered_classes: Dict[Tuple[str, ...], frozenset] = {}
+        self._itemprop_prices: List[Tag] = []
+        self._meta_entries: List[Tuple[str, str, str]] = []  # (lowercased name, lowercased property, content)
+        self._author_meta: Optional[Tag] = None
+        self._ld_json_scripts: List[Tag] = []
+        self._ld_json_sources: List[str] = []
+        self._ld_json_data: List[Any] = []
+    
+    def _collect_buckets(self):
+        """Walk the tree once, sorting elements into the buckets the analysis reads from"""
+        for element in self.soup.find_all(True):
+            self._add_element(element)
+        self._parse_ld_json()
+    
+    def _add_element(self, element):
+        """Sort one element (a Tag or a streamed record) into the buckets, in document order"""
+        self._tag_counts[element.name] += 1
+        if element.name in _KEPT_TAGS:
+            self._tags_by_name[element.name].append(element)
+        elif element.name == 'img' and len(self._classed_images) < _SUGGESTED_IMAGES and element.has_attr('class'):
+            self._classed_images.append(element)
+        
+        classes = element.get('class')
+        if classes:
+            # Pages repeat the same class lists many times; normalize each distinct list once
+            key = tuple(classes)
+            lowered = self._lowered_classes.get(key)
+            if lowered is None:
+                lowered = self._lowered_classes[key] = frozenset(cls.lower() for cls in classes)
+            for cls in lowered:
+                self._class_index[cls].append(len(self._classed))
+            self._classed.append((element, classes))
+        if element.get('itemprop') == 'price':
+            self._itemprop_prices.append(element)
+        if element.name == 'script' and element.get('type') == 'application/ld+json':
+            self._ld_json_scripts.append(element)
+        elif element.name == 'meta':
+            name = element.get('name', '')
+            self._meta_entries.append((
+                str(name).lower(),
+                str(element.get('property', '')).lower(),
+                str(element.get('content', ''))
+            ))
+            if name == 'author' and self._author_meta is None:
+                self._author_meta = element
+    
+    def _parse_ld_json(self):
+        """Parse the structured data once; the metadata and indicator checks all reuse it"""
+        # str() because a NavigableString subclass isn't accepted by orjson
+        self._ld_json_sources = [str(script.string or '') for script in self._ld_json_scripts]
+        self._ld_json_data = []
+        for source in self._ld_json_sources:
+            try:
+                if source:
+                    self._ld_json_data.append(_json_loads(source))
+            except (ValueError, RecursionError):
+                pass
+    
+    def _first(self, name: str) -> Optional[Tag]:
+        """First element with the given tag name, like soup.find(name)"""
+        elements = self._tags_by_name.get(name)
+        return elements[0] if elements else None
+    
+    def set_page_text(self, text: str):
+        """Supply the page's text, like soup.get_text(' ', strip=True), for an analyzer built without a soup"""
+        self._page_text = text
+        self._cache.pop('_text_lower', None)
+    
+    @_memoized
+    def _text_lower(self) -> str:
+        """The page's text, lowercased, for cheap phrase checks"""
+        if self._page_text is not None:
+            return self._page_text.lower()
+        return self.soup.get_text(' ', strip=True).lower()
+    
+    def _text(self, element) -> str:
+        """element.get_text(strip=True), computed once per element however many heuristics inspect it"""
+        text = self._texts.get(id(element))
+        if text is None:
+            text = self._texts[id(element)] = element.get_text(strip=True)
+        return text
+    
+    def _find_classed(self, *keywords: str) -> List[Tuple[Tag, List[str]]]:
+        """(element, classes) pairs, in document order, with a class containing any of the lowercase
+        keywords. Only the distinct class names are scanned, not every element."""
+        positions = set()
+        for cls, indexes in self._class_index.items():
+            if any(keyword in cls for keyword in keywords):
+                positions.update(indexes)
+        return [self._classed[i] for i in sorted(positions)]
+    
+    def _find_by_class(self, *keywords: str) -> List[Tag]:
+        """Elements, in document order, with a class containing any of the lowercase keywords"""
+        return [element for element, _ in self._find_classed(*keywords)]
     
     def analyze(self) -> Dict[str, Any]:
         """Perform comprehensive page analysis"""
+        if self.mode == 'meta':
+            return {'metadata': self._analyze_metadata()}
+        
         return {
             'metadata': self._analyze_metadata(),
             'structure': self._analyze_structure(),
@@ -26,7 +318,7 @@ class PageAnalyzer:
     def _analyze_metadata(self) -> Dict[str, Any]:
         """Extract metadata and meta tags"""
         meta = {
-            'title': self.soup.title.string if self.soup.title else None,
+            'title': self._first('title').string if self._first('title') else None,
             'description': None,
             'keywords': None,
             'og_tags': {},
@@ -34,11 +326,7 @@ class PageAnalyzer:
         }
         
         # Meta tags
-        for tag in self.soup.find_all('meta'):
-            name = str(tag.get('name', '')).lower()
-            prop = str(tag.get('property', '')).lower()
-            content = str(tag.get('content', ''))
-            
+        for name, prop, content in self._meta_entries:
             if name == 'description':
                 meta['description'] = content
             elif name == 'keywords':
@@ -47,13 +335,7 @@ class PageAnalyzer:
                 meta['og_tags'][prop] = content
         
         # Schema.org structured data
-        for script in self.soup.find_all('script', type='application/ld+json'):
-            try:
-                if script.string:
-                    schema_data = json.loads(script.string)
-                    meta['schema_org'].append(schema_data)
-            except:
-                pass
+        meta['schema_org'].extend(self._ld_json_data)
         
         return meta
     
@@ -63,10 +345,10 @@ class PageAnalyzer:
             'headings': self._get_heading_structure(),
             'main_container': self._find_main_container(),
             'navigation': self._find_navigation(),
-            'forms': len(self.soup.find_all('form')),
-            'tables': len(self.soup.find_all('table')),
-            'images': len(self.soup.find_all('img')),
-            'links': len(self.soup.find_all('a')),
+            'forms': self._tag_counts['form'],
+            'tables': self._tag_counts['table'],
+            'images': self._tag_counts['img'],
+            'links': self._tag_counts['a'],
             'semantic_tags': self._find_semantic_tags()
         }
         
@@ -74,48 +356,48 @@ class PageAnalyzer:
     
     def _get_heading_structure(self) -> List[Dict[str, str]]:
         """Get all headings with their hierarchy"""
-        headings = []
-        for tag in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-            for heading in self.soup.find_all(tag):
-                text = heading.get_text(strip=True)
-                if text:
-                    headings.append({
-                        'level': tag,
-                        'text': text[:100],  # Limit length
-                        'selector': self._generate_selector(heading)
-                    })
-        return headings
+        # Headings come straight from the buckets, level by level; empty ones never get a selector
+        texts = (
+            (tag, heading, self._text(heading))
+            for tag in _HEADING_TAGS
+            for heading in self._tags_by_name.get(tag, ())
+        )
+        return [
+            {
+                'level': tag,
+                'text': text[:100],  # Limit length
+                'selector': self._generate_selector(heading, tag_name=tag)
+            }
+            for tag, heading, text in texts if text
+        ]
     
+    @_memoized
     def _find_main_container(self) -> Optional[Dict[str, str]]:
         """Find the main content container"""
         # Look for semantic tags first
         for tag in ['main', 'article']:
-            element = self.soup.find(tag)
+            element = self._first(tag)
             if element:
+                eid, classes = element.get('id'), element.get('class') or []
                 tags = {
                     'tag': tag,
-                    'selector': self._generate_selector(element),
-                    'id': element.get('id'),
-                    'classes': element.get('class') or []
+                    'selector': self._generate_selector(element, eid=eid, classes=classes, tag_name=tag),
+                    'id': eid,
+                    'classes': classes
                 }
                 return tags
         
         # Look for common content class patterns
-        patterns = [
-            re.compile(r'content', re.I),
-            re.compile(r'main', re.I),
-            re.compile(r'article', re.I),
-            re.compile(r'post', re.I)
-        ]
-        
-        for pattern in patterns:
-            element = self.soup.find(class_=pattern)
-            if element:
+        for keyword in _MAIN_CLASSES:
+            matches = self._find_classed(keyword)
+            if matches:
+                element, classes = matches[0]
+                eid = element.get('id')
                 pat = {
                     'tag': element.name,
-                    'selector': self._generate_selector(element),
-                    'id': element.get('id'),
-                    'classes': element.get('class') or []
+                    'selector': self._generate_selector(element, eid=eid, classes=classes),
+                    'id': eid,
+                    'classes': classes
                 }
                 return pat
         
@@ -125,20 +407,20 @@ class PageAnalyzer:
         """Find navigation elements"""
         nav_elements = []
         
-        for nav in self.soup.find_all('nav'):
+        for nav in self._tags_by_name['nav']:
+            eid, classes = nav.get('id'), nav.get('class') or []
             nav_elements.append({
-                'selector': self._generate_selector(nav),
-                'links': len(nav.find_all('a')),
-                'id': nav.get('id'),
-                'classes': nav.get('class') or []
+                'selector': self._generate_selector(nav, eid=eid, classes=classes, tag_name='nav'),
+                'links': len(nav.find_all('a')) if isinstance(nav, Tag) else nav.link_count,
+                'id': eid,
+                'classes': classes
             })
         
         return nav_elements
     
     def _find_semantic_tags(self) -> Dict[str, int]:
         """Count semantic HTML5 tags"""
-        semantic_tags = ['header', 'footer', 'nav', 'main', 'article', 'section', 'aside']
-        return {tag: len(self.soup.find_all(tag)) for tag in semantic_tags}
+        return {tag: self._tag_counts[tag] for tag in _SEMANTIC_TAGS}
     
     def _analyze_content(self) -> Dict[str, Any]:
         """Analyze content patterns to identify key information"""
@@ -157,29 +439,23 @@ class PageAnalyzer:
         indicators = []
         
         # Look for elements with price-related classes
-        price_patterns = [
-            re.compile(r'price', re.I),
-            re.compile(r'cost', re.I),
-            re.compile(r'amount', re.I)
-        ]
-        
-        for pattern in price_patterns:
-            elements = self.soup.find_all(class_=pattern)
-            for elem in elements[:3]:  # Limit results
-                text = elem.get_text(strip=True)
+        for keyword in _PRICE_CLASSES:
+            elements = self._find_classed(keyword)
+            for elem, classes in elements[:3]:  # Limit results
+                text = self._text(elem)
                 # Check if contains currency symbols or numbers
-                if re.search(r'[$£€¥]|\d+[.,]\d{2}', text):
+                if _PRICE_RE.search(text):
                     indicators.append({
-                        'selector': self._generate_selector(elem),
+                        'selector': self._generate_selector(elem, classes=classes),
                         'text': text[:50],
                         'pattern_matched': 'class'
                     })
         
         # Look for itemprop="price"
-        for elem in self.soup.find_all(attrs={'itemprop': 'price'}):
+        for elem in self._itemprop_prices:
             indicators.append({
                 'selector': self._generate_selector(elem),
-                'text': elem.get_text(strip=True)[:50],
+                'text': self._text(elem)[:50],
                 'pattern_matched': 'itemprop'
             })
         
@@ -190,21 +466,20 @@ class PageAnalyzer:
         indicators = []
         
         # Look for time tags
-        for time_tag in self.soup.find_all('time'):
+        for time_tag in self._tags_by_name['time']:
             indicators.append({
-                'selector': self._generate_selector(time_tag),
+                'selector': self._generate_selector(time_tag, tag_name='time'),
                 'datetime': time_tag.get('datetime'),
-                'text': time_tag.get_text(strip=True)[:50],
+                'text': self._text(time_tag)[:50],
                 'pattern_matched': 'time_tag'
             })
         
         # Look for date-related classes
-        date_patterns = [re.compile(r'date', re.I), re.compile(r'published', re.I)]
-        for pattern in date_patterns:
-            for elem in self.soup.find_all(class_=pattern)[:3]:
+        for keyword in _DATE_CLASSES:
+            for elem, classes in self._find_classed(keyword)[:3]:
                 indicators.append({
-                    'selector': self._generate_selector(elem),
-                    'text': elem.get_text(strip=True)[:50],
+                    'selector': self._generate_selector(elem, classes=classes),
+                    'text': self._text(elem)[:50],
                     'pattern_matched': 'class'
                 })
         
@@ -215,7 +490,7 @@ class PageAnalyzer:
         indicators = []
         
         # Meta tag
-        author_meta = self.soup.find('meta', {'name': 'author'})
+        author_meta = self._author_meta
         if author_meta:
             indicators.append({
                 'selector': 'meta[name="author"]',
@@ -224,33 +499,34 @@ class PageAnalyzer:
             })
         
         # Class patterns
-        author_patterns = [re.compile(r'author', re.I), re.compile(r'byline', re.I)]
-        for pattern in author_patterns:
-            for elem in self.soup.find_all(class_=pattern)[:3]:
+        for keyword in _AUTHOR_CLASSES:
+            for elem, classes in self._find_classed(keyword)[:3]:
                 indicators.append({
-                    'selector': self._generate_selector(elem),
-                    'text': elem.get_text(strip=True)[:50],
+                    'selector': self._generate_selector(elem, classes=classes),
+                    'text': self._text(elem)[:50],
                     'pattern_matched': 'class'
                 })
         
         return indicators
     
+    @_memoized
     def _find_product_indicators(self) -> Dict[str, bool]:
         """Check for product page indicators"""
         return {
-            'has_add_to_cart': bool(self.soup.find(text=re.compile(r'add to cart', re.I))),
-            'has_buy_button': bool(self.soup.find(text=re.compile(r'buy now', re.I))),
-            'has_price': bool(self.soup.find(class_=re.compile(r'price', re.I))),
-            'has_product_schema': any('Product' in str(s) for s in self.soup.find_all('script', type='application/ld+json'))
+            'has_add_to_cart': 'add to cart' in self._text_lower(),
+            'has_buy_button': 'buy now' in self._text_lower(),
+            'has_price': bool(self._find_by_class('price')),
+            'has_product_schema': any('Product' in source for source in self._ld_json_sources)
         }
     
+    @_memoized
     def _find_article_indicators(self) -> Dict[str, bool]:
         """Check for article/blog page indicators"""
         return {
-            'has_article_tag': bool(self.soup.find('article')),
-            'has_author': bool(self.soup.find(class_=re.compile(r'author', re.I))),
-            'has_publish_date': bool(self.soup.find('time')),
-            'has_article_schema': any('Article' in str(s) for s in self.soup.find_all('script', type='application/ld+json'))
+            'has_article_tag': bool(self._tags_by_name['article']),
+            'has_author': bool(self._find_by_class('author')),
+            'has_publish_date': bool(self._tags_by_name['time']),
+            'has_article_schema': any('Article' in source for source in self._ld_json_sources)
         }
     
     def _suggest_selectors(self) -> Dict[str, List[str]]:
@@ -265,9 +541,9 @@ class PageAnalyzer:
         }
         
         # Title suggestions
-        h1 = self.soup.find('h1')
+        h1 = self._first('h1')
         if h1:
-            suggestions['title'].append(self._generate_selector(h1))
+            suggestions['title'].append(self._generate_selector(h1, tag_name='h1'))
         
         # Main content suggestions
         main_container = self._find_main_container()
@@ -275,11 +551,12 @@ class PageAnalyzer:
             suggestions['main_content'].append(main_container['selector'])
         
         # Image suggestions
-        for img in self.soup.find_all('img', class_=True)[:3]:
+        for img in self._classed_images:
             suggestions['images'].append(self._generate_selector(img))
         
         return suggestions
     
+    @_memoized
     def _detect_patterns(self) -> List[str]:
         """Detect common web patterns (e-commerce, blog, news, etc.) and return a list of detected patterns.
         Starts by detecting common patterns and then scoring them based on the presence of specific elements or classes.
@@ -287,34 +564,50 @@ class PageAnalyzer:
         patterns = []
         
         # E-commerce patterns
-        if (self.soup.find(text=re.compile(r'add to cart', re.I)) or 
-            self.soup.find(class_=re.compile(r'price', re.I))):
+        if ('add to cart' in self._text_lower() or 
+            self._find_by_class('price')):
             patterns.append('e-commerce')
         
         # Blog/Article patterns
-        if (self.soup.find('article') or 
-            self.soup.find(class_=re.compile(r'post|article', re.I))):
+        if (self._tags_by_name['article'] or 
+            self._find_by_class('post', 'article')):
             patterns.append('blog/article')
         
         # News patterns
-        if self.soup.find(class_=re.compile(r'news|headline', re.I)):
+        if self._find_by_class('news', 'headline'):
             patterns.append('news')
         
         # Documentation patterns
-        if self.soup.find(class_=re.compile(r'docs|documentation', re.I)):
+        if self._find_by_class('docs', 'documentation'):
             patterns.append('documentation')
         
         # Landing page patterns
-        if len(self.soup.find_all(class_=re.compile(r'hero|banner', re.I))) > 0:
+        if self._find_by_class('hero', 'banner'):
             patterns.append('landing_page')
         
         return patterns
     
     def _recommend_strategy(self) -> Dict[str, Any]:
-        """Recommend the best extraction strategy based on analysis. First, it checks for specific patterns,
-        then scores them based on the presence of specific elements or classes, and finally recommends the 
-        best strategy based on the score. Returns a dictionary with the recommended strategy, confidence 
-        score, and reasoning."""
+        """Recommend the best extraction strategy based on analysis. A page that declares exactly one of
+        schema.org Product or Article is decided from that alone, without the pattern scans. Otherwise it
+        checks for specific patterns, then scores them based on the presence of specific elements or classes,
+        and finally recommends the best strategy based on the score. Returns a dictionary with the
+        recommended strategy, confidence score, and reasoning."""
+        # Structured data is already parsed, so check it before any of the pattern scans
+        has_product, has_article = self._schema_kinds()
+        if has_product != has_article:
+            best = 'product' if has_product else 'article'
+            # Declared structured data counts as the top heuristic score (pattern 3 + indicators 2)
+            return {
+                'recommended': best,
+                'confidence': 5,
+                'scores': {'product': 5 if has_product else 0, 'article': 5 if has_article else 0, 'generic': 1},
+                'reasoning': [
+                    f"Page declares schema.org {'Product' if has_product else 'Article'} structured data",
+                    'Pattern scans skipped, so only the declared strategy is scored'
+                ]
+            }
+        
         patterns = self._detect_patterns()
         product_indicators = self._find_product_indicators()
         article_indicators = self._find_article_indicators()
@@ -363,14 +656,41 @@ class PageAnalyzer:
         
         return recommendation
     
+    def _schema_kinds(self) -> Tuple[bool, bool]:
+        """Whether the ld+json declares a Product type and an Article type, subtypes included
+        (ProductGroup, NewsArticle, BlogPosting, ...)"""
+        schema_types = self._schema_types()
+        has_product = any('Product' in declared for declared in schema_types)
+        has_article = any('Article' in declared or declared.endswith('Posting') for declared in schema_types)
+        return has_product, has_article
+    
+    @_memoized
+    def _schema_types(self) -> set:
+        """All @type values declared in the page's ld+json, including inside @graph"""
+        types = set()
+        pending = list(self._ld_json_data)
+        while pending:
+            item = pending.pop()
+            if isinstance(item, list):
+                pending.extend(item)
+            elif isinstance(item, dict):
+                declared = item.get('@type')
+                if isinstance(declared, str):
+                    types.add(declared)
+                elif isinstance(declared, list):
+                    types.update(t for t in declared if isinstance(t, str))
+                if item.get('@graph'):
+                    pending.append(item['@graph'])
+        return types
+    
     def _generate_selector_template(self) -> Dict[str, str]:
         """Generate a template for custom selector strategy."""
         template = {}
         
         # Title
-        h1 = self.soup.find('h1')
+        h1 = self._first('h1')
         if h1:
-            template['title'] = self._generate_selector(h1)
+            template['title'] = self._generate_selector(h1, tag_name='h1')
         
         # Main content
         main_container = self._find_main_container()
@@ -378,31 +698,28 @@ class PageAnalyzer:
             template['content'] = f"{main_container['selector']} p"
         
         # Price (if found)
-        price_elem = self.soup.find(class_=re.compile(r'price', re.I))
-        if price_elem:
-            template['price'] = self._generate_selector(price_elem)
+        price_elems = self._find_classed('price')
+        if price_elems:
+            element, classes = price_elems[0]
+            template['price'] = self._generate_selector(element, classes=classes)
         
         return template
     
-    def _generate_selector(self, element) -> str:
-        """Generate a CSS selector for an element"""
-        selector_parts = []
-        
+    def _generate_selector(self, element, *, eid: Optional[str] = None, classes: Optional[List[str]] = None,
+                           tag_name: Optional[str] = None) -> str:
+        """Generate a CSS selector for an element. Callers that already hold its id, classes or
+        tag name pass them in; anything left as None is read from the element."""
         # Use ID if available (most specific)
-        if element.get('id'):
-            return f"#{element.get('id')}"
-        
-        # Use classes
-        classes = element.get('class', [])
-        if classes:
-            # Use first class that's not generic
-            for cls in classes:
-                if cls and not cls.lower() in ['container', 'wrapper', 'content']:
-                    selector_parts.append(f".{cls}")
-                    break
-        
-        # Add tag name
-        if not selector_parts:
-            selector_parts.insert(0, element.name)
-        
-        return ''.join(selector_parts) if selector_parts else element.name
\ No newline at end of file
+        if eid is None:
+            eid = element.get('id')
+        if eid:
+            return f"#{eid}"
+        
+        # Use first class that's not generic
+        if classes is None:
+            classes = element.get('class') or ()
+        for cls in classes:
+            if cls and cls.lower() not in _GENERIC_CLASSES:
+                return f".{cls}"
+        
+        return tag_name or element.name
@@ -0,0 +1,18 @@
+"""
+Gunicorn settings for the web crawler service
+Every setting can be overridden from the environment
+"""
+
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:5052")
+
+# gevent workers overlap the service's many blocking network calls
+worker_class = "gevent"
+worker_connections = int(os.getenv("WORKER_CONNECTIONS", 1000))
+
+# Each worker keeps its own browser pool (BROWSER_POOL_SIZE), so lower this on small hosts
+workers = int(os.getenv("WEB_CONCURRENCY", (os.cpu_count() or 1) * 2))
+
+# Crawls and rendered pages can run long
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 120))
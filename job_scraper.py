@@ -1,5 +1,7 @@
 import os
 import csv
+import itertools
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from dotenv import load_dotenv
 
 # Modules
@@ -7,6 +9,35 @@ from pull_data import DataPuller
 
 load_dotenv()
 
+# Scraped jobs are written to the database in batches of this many rows
+LOAD_BATCH = int(os.getenv("LOAD_BATCH", 500))
+
+# Sites scraped at the same time
+SCRAPE_WORKERS = int(os.getenv("SCRAPE_WORKERS", 32))
+
+# Sites submitted but not yet loaded; finished scrapes wait here for the loader, so keep it near SCRAPE_WORKERS
+SCRAPE_WINDOW = int(os.getenv("SCRAPE_WINDOW", SCRAPE_WORKERS * 2))
+
+#==================== SQL Queries ====================
+
+SQL_UNRANKED_TITLES = """
+SELECT id, job_name, link
+FROM job
+WHERE title_rating IS NULL AND skip IS NOT True;
+"""
+
+SQL_SCRAPE_SUMMARIES = """
+SELECT id, link
+FROM job
+WHERE title_rating >= 80 AND skip IS NOT True AND job_summary IS NULL;
+"""
+
+SQL_UNRANKED_SUMMARIES = """
+SELECT id, job_name, link, job_summary
+FROM job
+WHERE title_rating >= 80 AND skip IS NOT True AND job_summary IS NOT NULL AND summary_rating IS NULL;
+"""
+
 #==================== Job Scraper ====================
 
 def main():
@@ -15,65 +46,49 @@ def main():
         db_config={
             'dbname': os.getenv("DBNAME", ""),
             'user': os.getenv("USER", ""),
-            'password': os.getenv("PASSWORD","")
+            'password': os.getenv("PASSWORD",""),
+            'host': os.getenv("DBHOST", "localhost"),
+            'port': os.getenv("DBPORT", "5432")
         }
     )
     
-    # Get sites file from .env and pulls the sites in. Needs to be a csv set up with name and site columns
+    # Get sites file from .env. Needs to be a csv set up with name and site columns
     sites_file = os.getenv("SITES","")
-    sites = dp.load_sites_list(sites_file)
-
-    # Pull in the site strategies based on the sites pulled from the sites file
-    site_strategies = []
-    data = []
-    for i in sites:
-        strategy = { 
-            "company": i['name'],
-            "site": i['site'],
-            "strategy": dp.load_site_strategies(i['name'])
-        }
-        site_strategies.append(strategy)
-
-    # Scrape the jobs from the sites using the link to the sites and the attached strategy
-    for i in site_strategies:
-       pulled_data = {"company": i['company'], "data":dp.scrape_data(i['site'], i['strategy'])}
-       for j in pulled_data['data']:
-           if j:
-            data.append({
-                "company": i['company'],
-                "title": j['title'],
-                "url": j['link'],
-                "location": j['location']
-                })
-            
-    # Load in the latest pulled in jobs
-    dp.load_scraped_data_to_db(data)
-    
-    # clear variables from data
-
-    del data, site_strategies, sites, sites_file, strategy, pulled_data
-
-    # build SQL queries
-    sql_read_queries = {
-        'unranked_titles' : f'''
-        SELECT id, job_name, link
-        FROM job
-        WHERE title_rating IS EMPTY AND skip IS NOT True;
-        ''',
-        'scrape_summaries': f'''
-        SELECT id,link
-        FROM job
-        WHERE title_rating >= 80 AND skip IS NOT True AND job_summary IS empty;
-        ''',
-        'unranked_summaries': f'''
-        SELECT id, job_name, link, job_summary
-        FROM job
-        WHERE title_rating >= 80 AND skip IS NOT True AND job_summary IS NOT empty and summary_rating IS empty;
-        '''
-    }
+
+    # Each site is read, its strategy loaded and the site scraped as one task, so scraping
+    # starts while the rest of the sites file is still being read
+    def scrape_site(site: dict) -> tuple:
+        strategy = dp.load_site_strategies(site['name'])
+        return site['name'], dp.scrape_data(site['site'], strategy)
+
+    with ThreadPoolExecutor(max_workers=SCRAPE_WORKERS) as executor:
+        sites = dp.iter_sites_list(sites_file)
+        scrapes = {executor.submit(scrape_site, site) for site in itertools.islice(sites, SCRAPE_WINDOW)}
+
+        # Load in the latest pulled in jobs, a batch at a time, as sites finish. Only SCRAPE_WINDOW
+        # sites are in flight, topped up from the sites file as each finished one is read and dropped
+        data = []
+        while scrapes:
+            done, scrapes = wait(scrapes, return_when=FIRST_COMPLETED)
+            scrapes |= {executor.submit(scrape_site, site) for site in itertools.islice(sites, len(done))}
+            while done:
+                company, pulled_data = done.pop().result()
+                for j in pulled_data:
+                    if j:
+                        data.append({
+                            "job_title": j['title'],
+                            "company": company,
+                            "location": j['location'],
+                            "link": j['link']
+                            })
+                    if len(data) >= LOAD_BATCH:
+                        dp.load_scraped_data_to_db(data)
+                        data.clear()
+        if data:
+            dp.load_scraped_data_to_db(data)
 
     # Get unranked titles
-    titles_to_process = dp.pull_data_DB(sql_read_queries['unranked_titles'])
+    titles_to_process = dp.pull_data_DB(SQL_UNRANKED_TITLES)
 
     # Run AI over unranked titles, or just score them
     # Update the titles with the title rankings
@@ -3,40 +3,154 @@ Web Crawling Microservice
 A customizable framework for extracting data from websites via REST API
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 import requests
-from bs4 import BeautifulSoup
-import time
-from dataclasses import asdict
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+import json
+import os
+import threading
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from flask_compress import Compress
+    COMPRESS_AVAILABLE = True
+except ImportError:
+    COMPRESS_AVAILABLE = False
 
 # Modules
 from app.data_models import CrawlConfig
-from app.extraction_strategies import ExtractionStrategy, GenericStrategy, SelectorStrategy, ProductStrategy, ArticleStrategy
-from app.page_analyzer import PageAnalyzer
-from app.crawler import WebCrawler, JSWebCrawler
-from app.javascript_renderer import JavaScriptRenderer
+from app.extraction_strategies import (
+    ExtractionStrategy, GenericStrategy, GenericStrategyFast, StreamingGenericStrategy, SelectorStrategy,
+    LxmlSelectorStrategy, ProductStrategy, ArticleStrategy, LXML_AVAILABLE, LXML_SELECTORS_AVAILABLE,
+    SELECTOLAX_AVAILABLE
+)
+from app.page_analyzer import PageAnalyzer, ANALYSIS_MODES
+from app.crawler import WebCrawler, JSWebCrawler, extract_page, resolve_parser, response_charset, to_json, STREAM_CHUNK_SIZE
+from app import browser_pool
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson, which also serializes dataclasses natively"""
+    
+    def dumps(self, obj, **kwargs) -> str:
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=kwargs.get('default', self.default), option=option).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
 app = Flask(__name__)
 
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
+
+# Gzip responses (streamed crawls included) when flask-compress is installed
+if COMPRESS_AVAILABLE:
+    app.config.update(COMPRESS_ALGORITHM='gzip', COMPRESS_LEVEL=4, COMPRESS_MIMETYPES=['application/json'])
+    Compress(app)
+
+# Shared session so page fetches reuse pooled keep-alive connections
+HTTP = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=64,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+)
+HTTP.mount('http://', _adapter)
+HTTP.mount('https://', _adapter)
+HTTP.headers.update({'User-Agent': 'CustomCrawler/1.0'})
+
+# /analyze results by (url, mode), with the validators needed to revalidate them: (etag, last_modified, analysis)
+ANALYZE_CACHE_SIZE = 1024
+_analyze_cache: 'OrderedDict[Tuple[str, str], Tuple[Optional[str], Optional[str], Dict]]' = OrderedDict()
+_analyze_cache_lock = threading.Lock()
+
+def _cached_analysis(key: Tuple[str, str]) -> Optional[Tuple[Optional[str], Optional[str], Dict]]:
+    with _analyze_cache_lock:
+        entry = _analyze_cache.get(key)
+        if entry is not None:
+            _analyze_cache.move_to_end(key)
+        return entry
+
+def _cache_analysis(key: Tuple[str, str], etag: Optional[str], last_modified: Optional[str], analysis: Dict):
+    with _analyze_cache_lock:
+        _analyze_cache[key] = (etag, last_modified, analysis)
+        _analyze_cache.move_to_end(key)
+        if len(_analyze_cache) > ANALYZE_CACHE_SIZE:
+            _analyze_cache.popitem(last=False)
+
 
 # ==================== Strategy Factory ====================
 
+# selectolax's lexbor parser builds trees differently from lxml/BeautifulSoup on malformed markup,
+# so the fast generic strategy is opt-in rather than picked just because the package is installed
+PREFER_SELECTOLAX = SELECTOLAX_AVAILABLE and os.getenv('PREFER_SELECTOLAX', '0').lower() in ('1', 'true')
+
 class StrategyFactory:
     """Factory for creating extraction strategies"""
     
+    # Strategies keep no per-page state, so one instance serves every request
+    _SINGLETONS: Dict[str, ExtractionStrategy] = {
+        # Extract while the response downloads rather than build a full soup (or use selectolax if asked to)
+        'generic': (GenericStrategyFast() if PREFER_SELECTOLAX else
+                    StreamingGenericStrategy() if LXML_AVAILABLE else GenericStrategy()),
+        'product': ProductStrategy(),
+        'article': ArticleStrategy()
+    }
+    
     @staticmethod
     def create(strategy_type: str, **kwargs) -> ExtractionStrategy:
         if strategy_type not in ['generic', 'product', 'article', 'selector']:
             raise ValueError(f"Unknown strategy: {strategy_type}")
         
-        if strategy_type == 'generic':
-            return GenericStrategy()
-        elif strategy_type == 'product':
-            return ProductStrategy()
-        elif strategy_type == 'article':
-            return ArticleStrategy()
-        else:  # strategy_type == 'selector'
-            return SelectorStrategy(kwargs.get('selectors', {}))
+        if strategy_type == 'selector':
+            # Selector configs are JSON, so their canonical dump identifies them
+            return _selector_strategy(json.dumps(kwargs.get('selectors', {}), sort_keys=True))
+        return StrategyFactory._SINGLETONS[strategy_type]
+
+@lru_cache(maxsize=256)
+def _selector_strategy(selectors_key: str) -> ExtractionStrategy:
+    """Build (and compile) a selector strategy once per distinct selector config"""
+    selectors = json.loads(selectors_key)
+    if LXML_SELECTORS_AVAILABLE:
+        try:
+            return LxmlSelectorStrategy(selectors)
+        except ValueError:
+            # cssselect lacks some soupsieve extensions (e.g. :-soup-contains)
+            pass
+    return SelectorStrategy(selectors)
+
+def stream_crawl(crawler: WebCrawler) -> Response:
+    """
+    Stream a crawl as one JSON document, encoding each page as soon as it is crawled.
+    The status comes last: a crawl that fails midway ends with "success": false and the error.
+    """
+    def generate():
+        count = 0
+        yield b'{"results":['
+        try:
+            for result in crawler.crawl():
+                yield (b',' if count else b'') + to_json(result)
+                count += 1
+        except Exception as e:
+            yield b'],"pages_crawled":%d,"success":false,"error":%s}' % (count, to_json(str(e)))
+            return
+        yield b'],"pages_crawled":%d,"success":true}' % count
+    
+    return Response(stream_with_context(generate()), mimetype='application/json')
 
 # ==================== API Endpoints ====================
 
@@ -77,9 +191,14 @@ def crawl():
             max_pages=config_data.get('max_pages', 10),
             delay=config_data.get('delay', 1.0),
             follow_links=config_data.get('follow_links', False),
+            max_links_per_page=config_data.get('max_links_per_page', 5),
+            concurrency=config_data.get('concurrency', 4),
             user_agent=config_data.get('user_agent', 'CustomCrawler/1.0'),
             timeout=config_data.get('timeout', 10),
-            headers=config_data.get('headers')
+            headers=config_data.get('headers'),
+            parser=config_data.get('parser', 'lxml'),
+            debug_log=config_data.get('debug_log', False),
+            debug_log_html=config_data.get('debug_log_html', False)
         )
         
         # Create strategy
@@ -89,15 +208,8 @@ def crawl():
             selectors=data.get('selectors', {})
         )
         
-        # Execute crawl
-        crawler = WebCrawler(config, strategy)
-        results = crawler.crawl()
-        
-        return jsonify({
-            'success': True,
-            'pages_crawled': len(results),
-            'results': [asdict(r) for r in results]
-        })
+        # Execute crawl, streaming pages to the client as they finish
+        return stream_crawl(WebCrawler(config, strategy))
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -134,10 +246,15 @@ def analyze_page():
     
     Request body:
     {
-        "url": "https://example.com"
+        "url": "https://example.com",
+        "mode": "full|meta",
+        "cache": true
     }
     
-    Returns a detailed map of the page structure with suggestions for selectors
+    Returns a detailed map of the page structure with suggestions for selectors.
+    "meta" mode only reads the <meta>, <title> and <script> tags and returns just the metadata.
+    Analyses are cached per URL and mode, and revalidated with the page's ETag/Last-Modified;
+    a 304 reuses the cached analysis. "cache": false always fetches and analyzes afresh.
     """
     try:
         data = request.get_json()
@@ -147,16 +264,44 @@ def analyze_page():
         
         url = data['url']
         
-        # Fetch the page
-        response = requests.get(url, timeout=10, headers={
-            'User-Agent': 'CustomCrawler/1.0'
-        })
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Analyze page structure
-        analyzer = PageAnalyzer(soup, url)
-        analysis = analyzer.analyze()
+        mode = data.get('mode', 'full')
+        if mode not in ANALYSIS_MODES:
+            return jsonify({'error': f"mode must be one of: {', '.join(ANALYSIS_MODES)}"}), 400
+        use_cache = data.get('cache', True)
+        
+        # Ask the server whether the cached analysis is still current
+        key = (url, mode)
+        cached = _cached_analysis(key) if use_cache else None
+        headers = {}
+        if cached:
+            etag, last_modified, _ = cached
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+        
+        # Fetch the page, analyzing it as it downloads when lxml is available
+        with HTTP.get(url, timeout=10, stream=True, headers=headers) as response:
+            if cached and response.status_code == 304:
+                analysis = cached[2]
+            elif LXML_AVAILABLE:
+                analysis = PageAnalyzer.analyze_stream(
+                    response.iter_content(STREAM_CHUNK_SIZE), url, mode=mode,
+                    encoding=response_charset(response)
+                )
+            else:
+                analyzer = PageAnalyzer.from_html(
+                    response.content,
+                    url,
+                    mode=mode,
+                    parser=resolve_parser('lxml'),
+                    encoding=response_charset(response)
+                )
+                analysis = analyzer.analyze()
+            
+            etag, last_modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+            if use_cache and response.status_code == 200 and (etag or last_modified):
+                _cache_analysis(key, etag, last_modified, analysis)
         
         return jsonify({
             'success': True,
@@ -185,26 +330,29 @@ def quick_extract():
         if not data or 'url' not in data:
             return jsonify({'error': 'URL is required'}), 400
         
-        config = CrawlConfig(
-            url=data['url'],
-            max_depth=0,
-            max_pages=1,
-            delay=0
-        )
-        
         strategy_type = data.get('strategy', 'generic')
         strategy = StrategyFactory.create(
             strategy_type,
             selectors=data.get('selectors', {})
         )
         
-        crawler = WebCrawler(config, strategy)
-        results = crawler.crawl()
+        # One page needs no crawler: fetch on the shared session and extract
+        result = extract_page(data['url'], strategy, HTTP, timeout=10, parser=resolve_parser('lxml'))
+        
+        if result.status_code == 403:
+            # Cloudflare challenges need the crawler's fallback client
+            config = CrawlConfig(
+                url=data['url'],
+                max_depth=0,
+                max_pages=1,
+                delay=0
+            )
+            result = next(WebCrawler(config, strategy).crawl(), None)
         
-        if results:
+        if result:
             return jsonify({
                 'success': True,
-                'data': asdict(results[0])
+                'data': result
             })
         else:
             return jsonify({'error': 'No data extracted'}), 500
@@ -251,39 +399,19 @@ def extract_js():
         actions = js_config.get('actions', [])
         headless = js_config.get('headless', True)
         
-        # Render page with Selenium
-        with JavaScriptRenderer(headless=headless) as renderer:
+        # Render page with a pooled browser
+        renderer = browser_pool.acquire(headless)
+        try:
             # Load page and wait for content
-            html = renderer.render_page(url, wait_config)
+            renderer.render_page(url, wait_config)
             
             # Perform actions if specified
-            for action in actions:
-                action_type = action.get('type')
-                
-                if action_type == 'click':
-                    selector = action.get('selector')
-                    if selector:
-                        renderer.click_element(selector)
-                
-                elif action_type == 'scroll':
-                    max_scrolls = action.get('max_scrolls', 10)
-                    pause_time = action.get('pause_time', 1.0)
-                    renderer.scroll_to_bottom(pause_time, max_scrolls)
-                
-                elif action_type == 'script':
-                    script = action.get('code')
-                    if script:
-                        renderer.execute_script(script)
-                
-                elif action_type == 'wait':
-                    # Additional wait after previous actions
-                    time.sleep(action.get('seconds', 1))
+            renderer.perform_actions(actions)
             
-            # Get final rendered HTML
-            html = renderer.render_page(url, wait_config)
-        
-        # Parse with BeautifulSoup
-        soup = BeautifulSoup(html, 'html.parser')
+            # The actions ran against the live page, so its DOM is the final HTML
+            html = renderer.get_html()
+        finally:
+            browser_pool.release(renderer)
         
         # Create strategy
         strategy_type = data.get('strategy', 'generic')
@@ -292,8 +420,11 @@ def extract_js():
             selectors=data.get('selectors', {})
         )
         
+        # Parse into the document the strategy works on
+        document = strategy.parse(html, resolve_parser('lxml'))
+        
         # Extract data
-        extracted_data = strategy.extract(soup, url)
+        extracted_data = strategy.extract(document, url)
         
         return jsonify({
             'success': True,
@@ -341,9 +472,14 @@ def crawl_js():
             max_pages=config_data.get('max_pages', 10),
             delay=config_data.get('delay', 1.0),
             follow_links=config_data.get('follow_links', False),
+            max_links_per_page=config_data.get('max_links_per_page', 5),
+            concurrency=config_data.get('concurrency', 4),
             user_agent=config_data.get('user_agent', 'CustomCrawler/1.0'),
             timeout=config_data.get('timeout', 10),
-            headers=config_data.get('headers')
+            headers=config_data.get('headers'),
+            parser=config_data.get('parser', 'lxml'),
+            debug_log=config_data.get('debug_log', False),
+            debug_log_html=config_data.get('debug_log_html', False)
         )
         
         # Create strategy
@@ -355,17 +491,11 @@ def crawl_js():
         
         # Create JS-enabled crawler
         js_config = data.get('js_config', {})
-        crawler = JSWebCrawler(config, strategy, js_config)
-        results = crawler.crawl()
-        
-        return jsonify({
-            'success': True,
-            'pages_crawled': len(results),
-            'results': [asdict(r) for r in results]
-        })
+        return stream_crawl(JSWebCrawler(config, strategy, js_config))
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5052, debug=True)
\ No newline at end of file
+    # Development server only; production runs under gunicorn (see wsgi.py)
+    app.run(host='0.0.0.0', port=5052, debug=os.getenv('FLASK_DEBUG', '0').lower() in ('1', 'true'))
\ No newline at end of file
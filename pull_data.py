@@ -1,6 +1,10 @@
+from typing import Iterator
 import aiohttp
+import asyncio
 import json
-import psycopg2
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
+from contextlib import contextmanager
 import csv
 import requests
 
@@ -9,33 +13,63 @@ ws_micro_port = "5052"
 
 class DataPuller:
     def __init__(self, host: str = ws_micro_host, port: str = ws_micro_port, db_config: dict = {}):
+        # host/port locate the scraping microservice; the database location comes from db_config
         self.host = host
         self.port = port
-        self.conn = psycopg2.connect(
-            dbname=db_config['dbname'],
-            user=db_config['user'],
-            password=db_config['password'],
-            host=self.host,
-            port=self.port
-        )
-        self.cursor = self.conn.cursor()
+        # Each task borrows its own connection, so threads can run statements side by side
+        self.pool = ThreadedConnectionPool(minconn=2, maxconn=16, **db_config)
+        # Reused for every scrape so calls to the same microservice keep their connection open
+        self.session = requests.Session()
+        self._aio_session = None
+
+    # Async use: `async with DataPuller(...) as dp:` shares one aiohttp session across pull_data calls
+
+    async def __aenter__(self):
+        self._aio_session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=100))
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self._aio_session.close()
+        self._aio_session = None
 
     async def pull_data(self, source: str, payload: dict = {}) -> dict:
         url = f"{self.host}:{self.port}/{source}/scrape"
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=payload) as response:
-                data = await response.json()
-                return data
-            data = await response.json()
-            return data
+        if self._aio_session is None:
+            # Outside `async with`, fall back to a one-off session
+            async with aiohttp.ClientSession() as session:
+                async with session.post(url, json=payload) as response:
+                    return await response.json()
+        async with self._aio_session.post(url, json=payload) as response:
+            return await response.json()
+
+    async def pull_many(self, items: list, concurrency: int = 20) -> list:
+        '''
+        Run pull_data for many sources at once, at most `concurrency` in flight
+        input format:
+            items = [{"source": str, "payload": dict}]
+        output format:
+            results in the same order as items
+        '''
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def pull_one(item: dict) -> dict:
+            async with semaphore:
+                return await self.pull_data(item['source'], item.get('payload', {}))
+
+        return await asyncio.gather(*(pull_one(item) for item in items))
 
     # Load list of sites to scrape
 
-    def load_sites_list(self,sites_file: str) -> list:
-        with open(sites_file, "r") as csvfile:
-            reader = csv.reader(csvfile)
-            sites = list(reader)
-        return sites
+    def iter_sites_list(self, sites_file: str) -> Iterator[dict]:
+        '''
+        Stream the sites file one row at a time, so scraping can start before it is fully read.
+        The csv needs a header row; each row comes back as a dict keyed by column (name, site)
+        '''
+        with open(sites_file, "r", newline="") as csvfile:
+            yield from csv.DictReader(csvfile)
+
+    def load_sites_list(self, sites_file: str) -> list:
+        return list(self.iter_sites_list(sites_file))
 
     # Pull request payload from .site_strategies/{site}.json
 
@@ -46,94 +80,101 @@ class DataPuller:
 
     # Load pulled data into database
 
-    async def scrape_data(self,site:str,payload:dict):
-        response_data = await requests.post(site, data=payload) # type: ignore
-        return response_data
+    def scrape_data(self,site:str,payload:dict):
+        # Blocking on purpose: job_scraper runs one call per site on a thread pool
+        response = self.session.post(site, data=payload)
+        return response.json()
 
     def load_scraped_data_to_db(self, data: list):
         '''
-        Load scraped data into PostgreSQL database
+        Load scraped data into PostgreSQL database, one set-based statement per table
         input format:
             data = [
                 {
-                    "job_title": str}
+                    "job_title": str,
                     "company": str,
-                    "city": str,
-                    "state": str,
+                    "location": str,
                     "link": str
                 }
             ]
-            db_config = {
-                'dbname': str,
-                'user': str,
-                'password': str,
-                'host': str,
-                'port': int
-            }
+        Duplicates are skipped by the server, so these unique constraints are required:
+            company (company_name)
+            office (company_id, location)
+            job (job_name, company_id, office_id)
         '''
-        
-        for item in data:
-            # Need checks for existing entries to avoid duplicates
-            # Start with checking if job, company, and location exist as a record
-            dup_record = self.cursor.execute(f"""
-            SELECT job.job_name,company.company_name, office.location
-            FROM job
-            JOIN company ON company.id = job.company_id
-            JOIN office on office.id = job.office_id
-            WHERE job.job_name = {item['job_title']} AND company.company_name = {item['company']} AND office.location = {item['location']};
-            """)
-
-            if dup_record:
-                continue  # Skip duplicate
-
-            # If not, check if company exists, if not insert company
-            company = self.cursor.execute(f"""
-            SELECT id FROM company WHERE company_name = {item['company']};
-            """)
-
-            if not company:
-                self.cursor.execute("""
-                INSERT INTO company (company_name) VALUES (%s)
-                """, (item['company'],))
-                company_id = self.cursor.lastrowid
-
-            # Then check if office record for company and location exists, if not insert office
-            office = self.cursor.execute(f"""
-            SELECT company.company_name, office.city_name, office.state
-            FROM office 
-            JOIN company ON company.id = office.company_id 
-            WHERE company.company_name = {item['company']} AND office.location = {item['location']};
-            """)
-            if not office:
-                self.cursor.execute("""
-                INSERT INTO office (company_id, location) VALUES (%s, %s, %s)
-                """, (company_id, item['location']))
-                office_id = self.cursor.lastrowid
-
-
-            # Finally insert job record linked to company and office
-            self.cursor.execute("""
-            INSERT INTO jobs (job_title, company, location, link)
-            VALUES (%s, %s, %s, %s)
-            """, (item['job_title'], item['company'], item['location'], item['link']))
-
-        self.conn.commit()
+        if not data:
+            return
+
+        with self._cursor() as cursor:
+            # Companies: insert the new ones, then map every name in the batch to its id
+            companies = sorted({item['company'] for item in data})
+            execute_values(cursor, """
+            INSERT INTO company (company_name) VALUES %s
+            ON CONFLICT (company_name) DO NOTHING
+            """, [(name,) for name in companies], page_size=len(companies))
+            cursor.execute("""
+            SELECT company_name, id FROM company WHERE company_name = ANY(%s)
+            """, (companies,))
+            company_ids = dict(cursor.fetchall())
+
+            # Offices: the same again, keyed on company and location
+            offices = sorted({(company_ids[item['company']], item['location']) for item in data})
+            execute_values(cursor, """
+            INSERT INTO office (company_id, location) VALUES %s
+            ON CONFLICT (company_id, location) DO NOTHING
+            """, offices, page_size=len(offices))
+            cursor.execute("""
+            SELECT company_id, location, id FROM office WHERE company_id = ANY(%s)
+            """, (sorted(company_ids.values()),))
+            office_ids = {(company_id, location): office_id for company_id, location, office_id in cursor.fetchall()}
+
+            # Jobs: one insert for the whole batch, postings already stored are left alone
+            jobs = []
+            for item in data:
+                company_id = company_ids[item['company']]
+                office_id = office_ids[(company_id, item['location'])]
+                jobs.append((item['job_title'], company_id, office_id, item['link']))
+            execute_values(cursor, """
+            INSERT INTO job (job_name, company_id, office_id, link) VALUES %s
+            ON CONFLICT (job_name, company_id, office_id) DO NOTHING
+            """, jobs, page_size=len(jobs))
 
         return
 
-    async def pull_data_DB (self, query: str = "") -> dict:
+    def pull_data_DB(self, query: str = "", params: tuple = ()) -> list:
         '''
-        Allows running of database queries, specifically select statements to pull data
+        Allows running of database queries, specifically select statements to pull data.
+        Values go in params and are bound through %s placeholders, never formatted into the query.
 
         input format:
-            source = str (name of microservice)
             query = str (SQL select statement)
+            params = tuple (values for the query's %s placeholders)
+        output format:
+            list of row tuples, in the query's column order
         '''
-        response = await self.cursor.execute(query) # type: ignore
-        return response.json()
+        with self._cursor() as cursor:
+            cursor.execute(query, params or None)
+            return cursor.fetchall()
+
+    @contextmanager
+    def _cursor(self):
+        '''
+        Borrow a pooled connection for one unit of work; commits when the block succeeds,
+        rolls back when it raises, and always hands the connection back
+        '''
+        conn = self.pool.getconn()
+        try:
+            with conn.cursor() as cursor:
+                yield cursor
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.pool.putconn(conn)
 
     def close_connection(self):
-        self.cursor.close()
-        self.conn.close()
+        self.pool.closeall()
+        self.session.close()
         return
     
@@ -0,0 +1,80 @@
+import unittest
+from unittest import mock
+
+from app import browser_pool
+from app.crawler import JSWebCrawler
+from app.data_models import CrawlConfig
+from app.extraction_strategies import SelectorStrategy
+from app.javascript_renderer import JavaScriptRenderer
+
+URL = 'https://example.com/list'
+
+PAGE = '<html><body><ul><li class="item">first</li></ul><button id="more">More</button></body></html>'
+PAGE_AFTER_CLICK = ('<html><body><ul><li class="item">first</li><li class="item">second</li></ul>'
+                    '<button id="more">More</button></body></html>')
+
+class FakeDriver:
+    """Stands in for a WebDriver: loading a URL gives PAGE, and clicking #more adds an item to the DOM"""
+    
+    def __init__(self):
+        self.loads = []
+        self.page_source = ''
+    
+    def get(self, url):
+        self.loads.append(url)
+        self.page_source = PAGE
+    
+    def set_script_timeout(self, seconds):
+        pass
+    
+    def execute_async_script(self, program):
+        if 'click("#more"' in program:
+            self.page_source = PAGE_AFTER_CLICK
+        return {'missing': []}
+
+def fake_renderer() -> JavaScriptRenderer:
+    renderer = JavaScriptRenderer()
+    renderer.driver = FakeDriver()
+    return renderer
+
+JS_CONFIG = {
+    'wait': {'type': 'time', 'value': 0},
+    'actions': [{'type': 'click', 'selector': '#more'}]
+}
+
+class JSActionsTest(unittest.TestCase):
+    """The rendered HTML must be read after the actions, not by loading the page again"""
+    
+    def test_crawler_keeps_dom_changes_from_actions(self):
+        renderer = fake_renderer()
+        strategy = SelectorStrategy({'items': {'selector': 'li.item', 'multiple': True}})
+        crawler = JSWebCrawler(CrawlConfig(url=URL, max_pages=1, delay=0), strategy, JS_CONFIG)
+        
+        with mock.patch.object(browser_pool, 'acquire', return_value=renderer), \
+             mock.patch.object(browser_pool, 'release'):
+            results = list(crawler.crawl())
+        
+        self.assertEqual(len(results), 1)
+        self.assertIsNone(results[0].error)
+        self.assertEqual(results[0].data['items'], ['first', 'second'])
+        self.assertEqual(renderer.driver.loads, [URL])
+    
+    def test_extract_js_keeps_dom_changes_from_actions(self):
+        import main
+        
+        renderer = fake_renderer()
+        with mock.patch.object(browser_pool, 'acquire', return_value=renderer), \
+             mock.patch.object(browser_pool, 'release'):
+            response = main.app.test_client().post('/extract-js', json={
+                'url': URL,
+                'strategy': 'selector',
+                'selectors': {'items': {'selector': 'li.item', 'multiple': True}},
+                'js_config': JS_CONFIG
+            })
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['data']['items'], ['first', 'second'])
+        self.assertEqual(renderer.driver.loads, [URL])
+
+if __name__ == '__main__':
+    unittest.main()
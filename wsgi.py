@@ -0,0 +1,10 @@
+"""
+WSGI entry point for production servers
+Run with: gunicorn -c gunicorn_conf.py wsgi:app
+"""
+
+# Patch before anything imports sockets, so blocking requests/Selenium calls yield to other greenlets
+from gevent import monkey
+monkey.patch_all()
+
+from main import app  # noqa: E402